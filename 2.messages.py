@@ -1,17 +1,17 @@
+import asyncio
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_clients import get_google_llm, get_openai_llm
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 load_dotenv()
 
-llm_openai = ChatOpenAI(model="gpt-4.1-nano", temperature=1) #initializing the openai model
+llm_openai = get_openai_llm(model="gpt-4.1-nano", temperature=1) #initializing the openai model (shared process-wide client)
 # Temperature - controls the randomness of the model's output
 # max temperature - 1.0 (most random)
 # min temperature - 0.0 (least random)
 # max tokens - controls the maximum number of tokens in the response
 # min tokens - controls the minimum number of tokens in the response
-llm_google = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=1) #initializing the google model
+llm_google = get_google_llm(temperature=1) #initializing the google model (shared process-wide client)
 
 m1 = "Who is the Prime Minister of India?" #first question
 
@@ -23,14 +23,18 @@ messages_2 = [
     SystemMessage(content ="You are a funny assistant that can answer questions and make jokes."),
     HumanMessage(content = "Tell me about the Volcano in Indonesia")]
 
-response = llm_openai.invoke(messages)
+async def ask_both():
+    # the two questions are independent - send them concurrently instead of
+    # waiting for the first answer before asking the second
+    return await asyncio.gather(llm_openai.ainvoke(messages), llm_openai.ainvoke(messages_2))
+
+response, response_2 = asyncio.run(ask_both())
 #display the type
 print(type(response))
 #display the content
 print(response.content)
 
 
-response_2 = llm_openai.invoke(messages_2)
 #display the type
 print(type(response_2))
 #display the content
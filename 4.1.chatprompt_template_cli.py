@@ -1,45 +1,69 @@
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-import argparse
+import asyncio
+from functools import lru_cache
+from llm_clients import get_google_llm
+from prompt_cli import MAX_CONCURRENCY, cached_renderer, parse_variables, setup_llm_cache, stream_cached
 
 load_dotenv()
 
-llm_google = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
-
-args = argparse.ArgumentParser(description="Generate learning outline using Gemini LLM")
-args.add_argument("--topic", type=str, help="Topic of the learning outline", required=True)
-args.add_argument("--audience", type=str, help="Target audience for the learning outline", required=True)
-
-parsed_args = args.parse_args()
-
-prompt = ChatPromptTemplate.from_messages(
-    [
-        ("system", "You are an expert educational content creator"),
-        ("human", """
-        Create a detailed learning outline on the topic of 
-        {topic} for {audience}.
-        Respond with format of: 
-        Topic Title: <title>
-        Content Outline: <List of bullet points>
-        """)
-    ]
-)
-# first step - build the prompt with variables
-# second step - invoke the LLM with build prompt
-
-#chaining is combining multiple steps into a single chain
-chain = prompt | llm_google # create a chain by piping prompt to llm (LCEL syntax)
-
-variables = {
-    "topic" : parsed_args.topic,
-    "audience": parsed_args.audience
-}
-
-response = chain.invoke(variables)
-print("Response from Gemini Model:")
-print("Response Content:")
-print(response.content)
-print("********************Gemini Response end******************************")
-
-#python 4.1.chatprompt_template_cli.py --topic "Agentic AI Bootcamp" --audience "Aspiring AI professionals"
\ No newline at end of file
+setup_llm_cache() # on-disk response cache (.llm_cache.db)
+
+# Build the prompt template once per process, not once per request
+@lru_cache(maxsize=1)
+def _build_prompt():
+    return ChatPromptTemplate.from_messages(
+        [
+            ("system", "You are an expert educational content creator"),
+            ("human", """
+            Create a detailed learning outline on the topic of 
+            {topic} for {audience}.
+            Respond with format of: 
+            Topic Title: <title>
+            Content Outline: <List of bullet points>
+            """)
+        ]
+    )
+
+# Rendered prompts are cached per (topic, audience) - treat them as read-only
+_render_prompt = cached_renderer(_build_prompt)
+
+def main():
+    variables_list = parse_variables("Generate learning outline using Gemini LLM")
+
+    # first step - build the prompt with variables
+    # second step - invoke the LLM with build prompt
+
+    #chaining is combining multiple steps into a single chain
+    render = RunnableLambda(lambda v: _render_prompt(v["topic"], v["audience"]))
+    llm = get_google_llm(temperature=0)
+    chain = render | llm # create a chain by piping prompt to llm (LCEL syntax)
+
+    if len(variables_list) == 1:
+        # Single request - stream tokens to the terminal as they arrive
+        # instead of waiting for the whole completion (a cached answer is replayed at once)
+        print("Response from Gemini Model:")
+        print("Response Content:")
+        variables = variables_list[0]
+        for text in stream_cached(llm, _render_prompt(variables["topic"], variables["audience"])):
+            print(text, end="", flush=True)
+        print()
+        print("********************Gemini Response end******************************")
+        return
+
+    # abatch runs the pairs concurrently (up to MAX_CONCURRENCY at a time)
+    # instead of one Gemini round-trip after another
+    responses = asyncio.run(chain.abatch(variables_list, config={"max_concurrency": MAX_CONCURRENCY}))
+
+    for variables, response in zip(variables_list, responses):
+        print(f"Response from Gemini Model ({variables['topic']} / {variables['audience']}):")
+        print("Response Content:")
+        print(response.content)
+        print("********************Gemini Response end******************************")
+
+if __name__ == "__main__":
+    main()
+
+#python 4.1.chatprompt_template_cli.py --topic "Agentic AI Bootcamp" --audience "Aspiring AI professionals"
+#python 4.1.chatprompt_template_cli.py --pairs pairs.json
@@ -1,56 +1,89 @@
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-import argparse
+import asyncio
+from functools import lru_cache
+from llm_clients import get_google_llm
+from prompt_cli import MAX_CONCURRENCY, cached_renderer, parse_variables, setup_llm_cache, stream_cached
 from pydantic import BaseModel, Field
-from langchain_core.output_parsers import PydanticOutputParser
 
 load_dotenv()
 
+setup_llm_cache() # on-disk response cache (.llm_cache.db)
+
 class LearningOutline(BaseModel):
     topic_title: str = Field(description="Title of the learning topic")
     content_outline: list[str] = Field(...,description = "A list of Bullet points representing the outline of the topic")
 
-parser = PydanticOutputParser(pydantic_object=LearningOutline)
-format_instructions = parser.get_format_instructions()
-
-llm_google = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
-
-args = argparse.ArgumentParser(description="Generate learning outline using Gemini LLM")
-args.add_argument("--topic", type=str, help="Topic of the learning outline", required=True)
-args.add_argument("--audience", type=str, help="Target audience for the learning outline", required=True)
-
-parsed_args = args.parse_args()
-
-prompt = ChatPromptTemplate.from_messages(
-    [
-        ("system", "You are an expert educational content creator"),
-        ("human", """
-        Create a detailed learning outline on the topic of 
-        {topic} for {audience}.
-        Respond in JSON format following these instructions: 
-        {format_instructions}
-        Do not include any commentary or md fences, 
-        adhere to JSON schema and field description strictly.
-        """)
-    ]
-)
-# first step - build the prompt with variables
-# second step - invoke the LLM with build prompt
-
-#chaining is combining multiple steps into a single chain
-chain = prompt | llm_google # create a chain by piping prompt to llm (LCEL syntax)
-
-variables = {
-    "topic" : parsed_args.topic,
-    "audience": parsed_args.audience,
-    "format_instructions": format_instructions
-}
-
-response = chain.invoke(variables)
-print("Response from Gemini Model:")
-print("Response Content:")
-print(response.content)
-print("********************Gemini Response end******************************")
-
-#python 4.2.json_format_output.py --topic "Agentic AI Bootcamp" --audience "Test Engineer"
\ No newline at end of file
+# Gemini native JSON mode: the schema is sent as a request parameter instead of
+# ~300 prompt tokens of format instructions, and the model is constrained to it,
+# so there is no free-text output to parse leniently
+@lru_cache(maxsize=1)
+def _json_llm():
+    return get_google_llm(temperature=0).bind(
+        response_mime_type="application/json",
+        response_schema=LearningOutline.model_json_schema(),
+    )
+
+# Building the prompt is pure work - do it once per process, not once per request
+@lru_cache(maxsize=1)
+def _build_prompt():
+    return ChatPromptTemplate.from_messages(
+        [
+            ("system", "You are an expert educational content creator"),
+            ("human", """
+            Create a detailed learning outline on the topic of 
+            {topic} for {audience}.
+            Adhere to the field descriptions strictly.
+            """)
+        ]
+    )
+
+# Rendered prompts are cached per (topic, audience) - treat them as read-only
+_render_prompt = cached_renderer(_build_prompt)
+
+def main():
+    variables_list = parse_variables("Generate learning outline using Gemini LLM")
+
+    # first step - build the prompt with variables
+    # second step - invoke the LLM with build prompt
+
+    #chaining is combining multiple steps into a single chain
+    render = RunnableLambda(lambda v: _render_prompt(v["topic"], v["audience"]))
+    chain = render | _json_llm() # create a chain by piping prompt to llm (LCEL syntax)
+
+    if len(variables_list) == 1:
+        # Single request - stream tokens to the terminal as they arrive (a cached
+        # answer is replayed at once). Validation needs the complete JSON, so keep
+        # a buffer and validate at the end
+        print("Response from Gemini Model:")
+        print("Response Content:")
+        variables = variables_list[0]
+        buffer = []
+        for text in stream_cached(_json_llm(), _render_prompt(variables["topic"], variables["audience"])):
+            print(text, end="", flush=True)
+            buffer.append(text)
+        print()
+        outline = LearningOutline.model_validate_json("".join(buffer))
+        print("Parsed Outline:")
+        print(outline)
+        print("********************Gemini Response end******************************")
+        return
+
+    # abatch runs the pairs concurrently (up to MAX_CONCURRENCY at a time)
+    # instead of one Gemini round-trip after another
+    responses = asyncio.run(chain.abatch(variables_list, config={"max_concurrency": MAX_CONCURRENCY}))
+
+    for variables, response in zip(variables_list, responses):
+        print(f"Response from Gemini Model ({variables['topic']} / {variables['audience']}):")
+        print("Response Content:")
+        print(response.content)
+        print("Parsed Outline:")
+        print(LearningOutline.model_validate_json(response.content))
+        print("********************Gemini Response end******************************")
+
+if __name__ == "__main__":
+    main()
+
+#python 4.2.json_format_output.py --topic "Agentic AI Bootcamp" --audience "Test Engineer"
+#python 4.2.json_format_output.py --pairs pairs.json
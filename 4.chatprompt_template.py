@@ -2,11 +2,11 @@ from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_clients import get_google_llm
 
 load_dotenv()
 
-llm_google = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
+llm_google = get_google_llm(temperature=0) # shared process-wide client
 
 prompt = ChatPromptTemplate.from_messages(
     [
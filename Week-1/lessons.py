@@ -5,15 +5,117 @@ This file demonstrates the progression from broken code to production-ready solu
 All 5 fixes are implemented and documented.
 """
 
+import asyncio
+import atexit
 import logging
+import os
+import random
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import wraps
+from typing import Protocol
+from urllib.parse import quote
 
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
+_BASE = "https://crm.api/customers/"
+
+
+def _customer_url(customer_id: str) -> str:
+    """
+    Build the CRM URL for a customer.
+
+    customer_id is percent-encoded (safe="" also encodes "/"), so an id with
+    spaces, slashes or "?" can't change the path or inject a query string.
+    """
+    return _BASE + quote(customer_id, safe="")
+
+# Shared async HTTP client for the CRM API.
+# One client = one connection pool, so concurrent support conversations
+# reuse warm keep-alive connections instead of paying a TCP/TLS handshake
+# on every call.
+_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    timeout=5.0,
+)
+
+
+def _close_http_client():
+    """Close the shared CRM client when the interpreter exits."""
+    if _http_client.is_closed:
+        return
+    try:
+        asyncio.run(_http_client.aclose())
+    except RuntimeError:
+        # An event loop is still running (e.g. inside a server) - its own
+        # shutdown hook is responsible for closing the client.
+        pass
+
+
+atexit.register(_close_http_client)
+
+# Shared requests.Session for the synchronous examples below.
+# Reuses urllib3's connection pool instead of a fresh TCP+TLS connection per
+# call. urllib3 retries are off - retrying is our decorator's job.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0))
+
+# Client-side rate limiter sized to the CRM quota (100 requests / minute).
+# Retries and the circuit breaker react AFTER a 429; this token bucket stops
+# us from sending over-quota traffic in the first place.
+_crm_limiter = AsyncLimiter(max_rate=100, time_period=60)
+
+
+class _SyncTokenBucket:
+    """
+    Blocking token bucket for the synchronous _session calls.
+
+    Same quota as _crm_limiter (AsyncLimiter only works inside an event
+    loop). Thread-safe, so sync callers on several threads share one budget.
+    """
+
+    def __init__(self, max_rate, time_period):
+        self.capacity = max_rate
+        self.rate = max_rate / time_period  # tokens refilled per second
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+# Both limiters draw on the same CRM quota, but each counts only its own
+# traffic - mixing sync and async callers in one process can exceed it.
+_crm_sync_limiter = _SyncTokenBucket(max_rate=100, time_period=60)
+
 
 # ============================================================================
 # BEFORE: THE BROKEN CODE
@@ -34,11 +136,12 @@ def get_customer_data_BROKEN(customer_id):
     When CRM API returns 429, this raises an exception and the entire agent fails.
     """
     API_KEY = "YOUR_API_KEY_HERE"  # Would be from config in real code
-    response = requests.get(
-        f"https://crm.api/customers/{customer_id}",
-        headers={"Authorization": f"Bearer {API_KEY}"}
-    )
-    return response.json()  # Crashes on 429 or any error
+    with _crm_sync_limiter:
+        response = _session.get(
+            _customer_url(customer_id),
+            headers={"Authorization": f"Bearer {API_KEY}"}
+        )
+    return orjson.loads(response.content)  # Crashes on 429 or any error
 
 
 # ============================================================================
@@ -54,10 +157,11 @@ def get_customer_data_with_error_handling(customer_id):
     But returning None isn't enough - the agent still needs to respond.
     """
     try:
-        response = requests.get(
-            f"https://crm.api/customers/{customer_id}",
-            timeout=5
-        )
+        with _crm_sync_limiter:
+            response = _session.get(
+                _customer_url(customer_id),
+                timeout=5
+            )
 
         # Rate limited - don't crash
         if response.status_code == 429:
@@ -65,55 +169,123 @@ def get_customer_data_with_error_handling(customer_id):
             return None
 
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
     except requests.RequestException as e:
         logger.error(f"CRM API error: {e}")
         return None
 
+    except orjson.JSONDecodeError:
+        logger.error("Invalid JSON from CRM")
+        return None
+
 
 # ============================================================================
 # FIX 2: RETRY WITH EXPONENTIAL BACKOFF
 # ============================================================================
 # Retry failed requests intelligently with increasing delays
 
-def retry_with_backoff(max_retries=3, base_delay=1):
+# 429 and 5xx are transient - worth retrying. Any other 4xx (400, 401, 403,
+# 404, ...) means the request itself is wrong, so retrying only wastes quota.
+RETRYABLE_EXCEPTIONS = (httpx.TransportError, ConnectionError, TimeoutError)
+
+
+def _is_retryable_status(status_code: int) -> bool:
+    """True for rate limits (429) and server errors (5xx)."""
+    return status_code == 429 or status_code >= 500
+
+
+def _parse_retry_after(value):
+    """
+    Parse a Retry-After header into seconds to wait.
+
+    The header is either delta-seconds ("45") or an HTTP-date
+    ("Wed, 21 Oct 2015 07:28:00 GMT"). Returns None if missing or unparseable.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def retry_with_backoff(max_retries=3, base_delay=1, max_delay=30):
     """
-    FIX 2: Retry decorator with exponential backoff
+    FIX 2: Async retry decorator with exponential backoff and full jitter
 
     How it works:
     - Attempt 1: Immediate
-    - Attempt 2: Wait 1 second, retry
-    - Attempt 3: Wait 2 seconds, retry
-    - Attempt 4: Wait 4 seconds, retry
+    - Attempt 2: Wait random 0-1 seconds, retry
+    - Attempt 3: Wait random 0-2 seconds, retry
+    - Attempt 4: Wait random 0-4 seconds, retry
+    - No single wait is longer than max_delay (truncated backoff)
 
-    If rate limit resets in 30 seconds, our retries give it time.
-    We're not hammering the API - we're being respectful.
+    If the server sends Retry-After, we wait exactly that long instead -
+    it knows better than our guess when the rate limit resets. A
+    Retry-After longer than max_delay is never shortened: we stop retrying
+    and return the 429, and the circuit breaker honours it (retry_after).
+
+    Why jitter: when 100 clients hit a 429 at the same moment, fixed delays
+    make them all retry at the same moment too (thundering herd).
+    Random delays spread the retries out.
+
+    Only transient failures are retried: 429, 5xx and connection errors.
+    Other 4xx responses (400/401/403/404) are returned immediately.
+
+    Waits use asyncio.sleep, so other conversations keep running while
+    this one backs off.
     """
 
+    def backoff_delay(attempt, response=None):
+        retry_after = None
+        if response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+
+        if retry_after is not None:
+            # Server-provided - never cap it (the caller gives up if it is too long)
+            return retry_after
+
+        return min(random.uniform(0, base_delay * (2 ** attempt)), max_delay)
+
     def decorator(func):
         @wraps(func)
-        def wrapper(*args, **kwargs):
+        async def wrapper(*args, **kwargs):
             for attempt in range(max_retries):
                 try:
-                    response = func(*args, **kwargs)
+                    response = await func(*args, **kwargs)
 
-                    # If rate limited or None, retry with backoff
-                    if response is None or getattr(response, "status_code", 200) == 429:
+                    # No response, rate limited or server error - retry with backoff
+                    if response is None or _is_retryable_status(response.status_code):
                         if attempt < max_retries - 1:
-                            delay = base_delay * (2 ** attempt)  # 1s, 2s, 4s
-                            logger.info(f"Retry {attempt + 1} in {delay}s")
-                            time.sleep(delay)
+                            delay = backoff_delay(attempt, response)
+                            if delay > max_delay:
+                                # Retrying earlier than the server asked would just burn quota
+                                logger.warning(f"Retry-After {delay:.0f}s exceeds max_delay, giving up")
+                                return response
+                            logger.info(f"Retry {attempt + 1} in {delay:.2f}s")
+                            await asyncio.sleep(delay)
                             continue
 
                     return response
 
-                except Exception as e:
+                except RETRYABLE_EXCEPTIONS as e:
                     if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)
+                        delay = backoff_delay(attempt)
                         logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                        time.sleep(delay)
+                        await asyncio.sleep(delay)
                     else:
+                        logger.warning(f"Attempt {attempt + 1} failed, giving up: {e}")
                         raise
 
             return None
@@ -123,16 +295,20 @@ def retry_with_backoff(max_retries=3, base_delay=1):
     return decorator
 
 
-@retry_with_backoff(max_retries=3, base_delay=1)
-def _fetch_customer(customer_id: str):
+@retry_with_backoff(max_retries=3, base_delay=1, max_delay=30)
+async def _fetch_customer(customer_id: str):
     """
     Internal function: Fetch customer data from CRM API with retry logic.
     Returns response object (not JSON) so we can check status codes.
+    Uses the shared _http_client so connections are pooled and reused.
+
+    Every attempt (including retries) first takes a token from _crm_limiter,
+    so we never send more than the CRM quota and rarely see a 429 at all.
     """
-    return requests.get(
-        f"https://crm.api/customers/{customer_id}",
-        timeout=5
-    )
+    async with _crm_limiter:
+        return await _http_client.get(
+            _customer_url(customer_id)
+        )
 
 
 # ============================================================================
@@ -155,85 +331,156 @@ class CircuitBreaker:
     When CRM API is down, we don't hammer it with requests.
     We back off, give it time to recover, then test periodically.
     This prevents cascading failures and keeps your system stable.
+
+    Concurrency:
+    - State changes happen under a lock, so parallel calls (asyncio.gather,
+      thread pools) can't race on failure_count or state.
+    - Half-open admits exactly ONE probe request; everyone else is
+      rejected until the probe finishes.
+    - Timeouts use time.monotonic(), which never jumps with NTP/DST changes.
+
+    Rate limits:
+    - A 429 counts as a failure, and its Retry-After header (if any) replaces
+      the 60 second timeout for that open cycle.
     """
 
     def __init__(self, failure_threshold=5, timeout=60):
         self.failure_threshold = failure_threshold  # Open circuit after N failures
         self.timeout = timeout  # seconds to wait before testing again
         self.failure_count = 0
-        self.last_failure_time = None
+        self.last_failure_time = None  # time.monotonic() of last failure
         self.state = "closed"  # closed, open, half-open
+        self._current_timeout = timeout  # wait for THIS open cycle (Retry-After can change it)
+        self._half_open_in_flight = 0  # probes currently running in half-open
+        self._lock = threading.Lock()
 
-    def call(self, func, *args, **kwargs):
+    async def call(self, func, *args, **kwargs):
         """
-        Execute function through circuit breaker.
+        Execute async function through circuit breaker.
         Returns None if circuit is open or call fails.
         """
-        # If circuit is open, check if timeout has passed
-        if self.state == "open":
-            if datetime.now() - self.last_failure_time > timedelta(seconds=self.timeout):
-                # Timeout passed - try once (half-open state)
-                self.state = "half-open"
-                logger.info("Circuit breaker: half-open (testing)")
-            else:
-                # Still in timeout - don't call API
-                logger.warning("Circuit breaker: open (not calling API)")
-                return None
+        is_probe = False
+
+        with self._lock:
+            # If circuit is open, check if timeout has passed
+            if self.state == "open":
+                if time.monotonic() - self.last_failure_time > self._current_timeout:
+                    # Timeout passed - try once (half-open state)
+                    self.state = "half-open"
+                    logger.info("Circuit breaker: half-open (testing)")
+                else:
+                    # Still in timeout - don't call API
+                    logger.warning("Circuit breaker: open (not calling API)")
+                    return None
 
-        # Try the call
+            if self.state == "half-open":
+                if self._half_open_in_flight >= 1:
+                    # Another request is already probing - don't pile on
+                    logger.warning("Circuit breaker: half-open (probe in flight, not calling API)")
+                    return None
+                self._half_open_in_flight += 1
+                is_probe = True
+
+        # Try the call (lock is NOT held while we wait on the network)
         try:
-            result = func(*args, **kwargs)
+            result = await func(*args, **kwargs)
+
+            # Rate limited - the server tells us when to come back
+            if hasattr(result, "status_code") and result.status_code == 429:
+                self._record_failure(
+                    retry_after=_parse_retry_after(result.headers.get("Retry-After"))
+                )
+                return None
 
             # Check if result indicates failure
             if result is None or (hasattr(result, "status_code") and result.status_code >= 500):
                 self._record_failure()
                 return None
 
-            # Success - reset circuit if it was half-open
-            if self.state == "half-open":
+            # Success - reset circuit if this was the half-open probe
+            if is_probe:
                 self._reset()
                 logger.info("Circuit breaker: closed (recovered)")
 
             return result
 
-        except Exception as e:
-            # Exception occurred - record failure
+        except (requests.RequestException, httpx.TransportError, TimeoutError) as e:
+            # Transport fault (connection refused, timeout, ...) - record failure.
+            # Anything else (AttributeError, TypeError, ...) is a bug in our code:
+            # let it propagate instead of tripping the breaker on a healthy API.
+            logger.warning(f"Circuit breaker: call failed: {e}")
             self._record_failure()
             return None
 
-    def _record_failure(self):
-        """Record a failure and open circuit if threshold reached."""
-        self.failure_count += 1
-        self.last_failure_time = datetime.now()
+        finally:
+            if is_probe:
+                with self._lock:
+                    self._half_open_in_flight -= 1
+
+    def _record_failure(self, retry_after=None):
+        """
+        Record a failure and open circuit if threshold reached.
+
+        retry_after: seconds from the server's Retry-After header. If given,
+        the circuit waits exactly that long before probing instead of the
+        fixed timeout - no idle capacity, no probing too early.
+        """
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.monotonic()
+            self._current_timeout = self.timeout if retry_after is None else retry_after
 
-        if self.failure_count >= self.failure_threshold:
-            self.state = "open"
-            logger.error(f"Circuit breaker: opened after {self.failure_count} failures")
+            # A failed half-open probe re-opens the circuit straight away
+            if self.state == "half-open" or self.failure_count >= self.failure_threshold:
+                self.state = "open"
+                logger.error(f"Circuit breaker: opened after {self.failure_count} failures")
 
     def _reset(self):
         """Reset circuit breaker to closed state after successful recovery."""
-        self.failure_count = 0
-        self.state = "closed"
+        with self._lock:
+            self.failure_count = 0
+            self.state = "closed"
+            self._current_timeout = self.timeout
 
 
 # Create circuit breaker instance for CRM API
 crm_circuit_breaker = CircuitBreaker(failure_threshold=5, timeout=60)
 
 
-def get_customer_data_safe(customer_id: str):
+class Customer(BaseModel):
+    """
+    Validated CRM customer record.
+
+    Validated once when it comes off the wire, then cached as-is, so cache
+    hits skip JSON parsing AND validation, and callers get attribute access
+    (customer.name) instead of dict lookups that KeyError on bad payloads.
+    """
+    name: str
+    tier: str
+    recent_issues: list[str]
+
+
+async def get_customer_data_safe(customer_id: str):
     """
     Get customer data with circuit breaker protection.
     Combines retry logic (via decorator) with circuit breaker.
+    Returns a validated Customer, or None if unavailable.
     """
-    response = crm_circuit_breaker.call(_fetch_customer, customer_id)
+    response = await crm_circuit_breaker.call(_fetch_customer, customer_id)
 
     if response is None:
         return None
 
+    # Non-retryable 4xx (or a 429 that outlasted our retries) - no usable data
+    if response.status_code >= 400:
+        logger.warning(f"CRM returned {response.status_code} for customer {customer_id}")
+        return None
+
     try:
-        return response.json()
-    except ValueError:
-        logger.error("Invalid JSON from CRM")
+        # orjson decodes 2-5x faster than stdlib json on the cache-miss path
+        return Customer.model_validate(orjson.loads(response.content))
+    except ValueError:  # bad JSON or pydantic ValidationError
+        logger.error("Invalid customer payload from CRM")
         return None
 
 
@@ -242,7 +489,7 @@ def get_customer_data_safe(customer_id: str):
 # ============================================================================
 # Provide fallback behavior when CRM API is unavailable
 
-def handle_support_request(user_message: str, customer_id: str, agent):
+async def handle_support_request(user_message: str, customer_id: str, agent):
     """
     FIX 4: Fallback strategy for graceful degradation
 
@@ -256,14 +503,14 @@ def handle_support_request(user_message: str, customer_id: str, agent):
     Important principle: Degrade gracefully. Don't fail completely.
     """
     # Try to get customer data
-    customer_data = get_customer_data_safe(customer_id)
+    customer_data = await get_customer_data(customer_id)
 
     if customer_data:
         # Normal path: Use customer data for personalized support
         context = f"""
-        Customer: {customer_data['name']}
-        Tier: {customer_data['tier']}
-        Recent issues: {customer_data['recent_issues']}
+        Customer: {customer_data.name}
+        Tier: {customer_data.tier}
+        Recent issues: {customer_data.recent_issues}
         """
         response = agent.run(user_message, context=context)
 
@@ -290,9 +537,89 @@ def handle_support_request(user_message: str, customer_id: str, agent):
 # ============================================================================
 # Cache customer data to reduce API calls and stay within rate limits
 
+class CacheBackend(Protocol):
+    """Where cached customer data lives. Swap backends without touching callers."""
+
+    def get(self, key: str): ...
+
+    def set(self, key: str, value, ttl: int) -> None: ...
+
+
+class DictCacheBackend:
+    """
+    In-process LRU+TTL cache (default).
+
+    Fastest option, but each process (e.g. each Gunicorn worker) has its own
+    copy and it is empty again after every restart/deploy.
+    TTLCache uses one TTL for every entry, fixed at construction.
+    """
+
+    def __init__(self, ttl_seconds=300, max_size=10_000):
+        self._cache = TTLCache(maxsize=max_size, ttl=ttl_seconds)
+        self._lock = threading.RLock()  # TTLCache is not thread-safe
+
+    def get(self, key: str):
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, value, ttl: int) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+
+class RedisCacheBackend:
+    """
+    Shared Redis cache (CACHE_BACKEND=redis).
+
+    One copy for all workers and it survives restarts, so a 4-worker
+    deployment makes 1x the API calls instead of 4x and the cache is warm
+    right after a deploy. Entries expire via Redis EX. Values are stored as
+    the model's JSON and validated back into the model on read.
+
+    If Redis is unreachable, or an entry no longer validates (e.g. written
+    before Customer changed), we log and treat it as a cache miss - the CRM
+    path (with retry + circuit breaker) still works.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="crm:customer:", model=Customer):
+        import redis  # optional dependency - only needed for this backend
+
+        self._redis = redis.Redis.from_url(url)
+        self._errors = redis.RedisError
+        self.prefix = prefix
+        self.model = model
+
+    def get(self, key: str):
+        try:
+            raw = self._redis.get(self.prefix + key)
+        except self._errors as e:
+            logger.warning(f"Redis cache unavailable: {e}")
+            return None
+        if raw is None:
+            return None
+        try:
+            return self.model.model_validate_json(raw)
+        except ValueError as e:  # pydantic ValidationError - stale (old schema) or corrupt entry
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+    def set(self, key: str, value, ttl: int) -> None:
+        try:
+            self._redis.set(self.prefix + key, value.model_dump_json(), ex=ttl)
+        except self._errors as e:
+            logger.warning(f"Redis cache unavailable: {e}")
+
+
+def _make_cache_backend(ttl_seconds) -> CacheBackend:
+    """Pick the backend from CACHE_BACKEND (memory | redis), default memory."""
+    if os.environ.get("CACHE_BACKEND", "memory").lower() == "redis":
+        return RedisCacheBackend(url=os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+    return DictCacheBackend(ttl_seconds=ttl_seconds)
+
+
 class CustomerDataCache:
     """
-    FIX 5: Simple in-memory cache with TTL
+    FIX 5: Cache with TTL and a pluggable backend
 
     Impact:
     - Before: Every request → API call
@@ -304,30 +631,58 @@ class CustomerDataCache:
 
     Result: 80% reduction in API calls for typical usage patterns.
     Now we're well within rate limits.
+
+    Backends:
+    - DictCacheBackend (default): bounded in-memory LRU, expired entries
+      are dropped instead of piling up forever
+    - RedisCacheBackend (CACHE_BACKEND=redis): shared by every worker and
+      survives restarts
+
+    Stampede protection: _inflight tracks fetches that are already running,
+    so when a hot entry expires only ONE request goes to the CRM and the
+    others wait for its result (single-flight).
     """
 
-    def __init__(self, ttl_seconds=300):  # 5 minute TTL
-        self.cache = {}
-        self.ttl = timedelta(seconds=ttl_seconds)
+    def __init__(self, ttl_seconds=300, backend: CacheBackend = None):  # 5 minute TTL
+        self.ttl = ttl_seconds
+        self.backend = backend if backend is not None else _make_cache_backend(ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # guards the hit/miss counters
+        # customer_id -> Future of the fetch currently running for it
+        self._inflight: dict[str, asyncio.Future] = {}
 
     def get(self, customer_id: str):
         """Get cached data if it exists and hasn't expired."""
-        if customer_id in self.cache:
-            data, timestamp = self.cache[customer_id]
-            if datetime.now() - timestamp < self.ttl:
-                return data
-        return None
+        data = self.backend.get(customer_id)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
 
     def set(self, customer_id: str, data):
-        """Store data in cache with current timestamp."""
-        self.cache[customer_id] = (data, datetime.now())
+        """Store data in cache (expires after ttl seconds)."""
+        self.backend.set(customer_id, data, self.ttl)
+
+    def stats(self) -> dict:
+        """Cache metrics for monitoring - watch hit_rate over time."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
 
 
 # Create cache instance
 customer_cache = CustomerDataCache(ttl_seconds=300)
 
 
-def get_customer_data(customer_id: str):
+async def get_customer_data(customer_id: str):
     """
     FINAL SOLUTION: Get customer data with all fixes applied
 
@@ -340,9 +695,13 @@ def get_customer_data(customer_id: str):
 
     Flow:
     1. Check cache first (reduces API calls by 80%)
-    2. If cache miss, call get_customer_data_safe (with retry + circuit breaker)
-    3. If successful, store in cache
-    4. Return data (or None if unavailable)
+    2. If another request is already fetching this customer, wait for it
+    3. Otherwise call get_customer_data_safe (with retry + circuit breaker)
+    4. If successful, store in cache
+    5. Return data (or None if unavailable)
+
+    Step 2 prevents a cache stampede: when an entry expires under load,
+    N concurrent requests make 1 API call instead of N.
     """
     # Check cache first
     cached = customer_cache.get(customer_id)
@@ -350,14 +709,32 @@ def get_customer_data(customer_id: str):
         logger.info(f"Cache hit for customer {customer_id}")
         return cached
 
-    # Cache miss - fetch from API (with all protections)
-    data = get_customer_data_safe(customer_id)
+    # Someone is already fetching this customer - share their result.
+    # shield() so a cancelled waiter doesn't cancel the shared fetch.
+    inflight = customer_cache._inflight.get(customer_id)
+    if inflight is not None:
+        logger.info(f"Joining in-flight fetch for customer {customer_id}")
+        return await asyncio.shield(inflight)
 
-    # Store in cache if successful
-    if data:
-        customer_cache.set(customer_id, data)
+    future = asyncio.get_running_loop().create_future()
+    customer_cache._inflight[customer_id] = future
+
+    try:
+        # Cache miss - fetch from API (with all protections)
+        data = await get_customer_data_safe(customer_id)
 
-    return data
+        # Store in cache if successful
+        if data:
+            customer_cache.set(customer_id, data)
+
+        future.set_result(data)
+        return data
+
+    finally:
+        del customer_cache._inflight[customer_id]
+        if not future.done():
+            # Fetch blew up or was cancelled - waiters fall back like any miss
+            future.set_result(None)
 
 
 # ============================================================================
@@ -365,12 +742,14 @@ def get_customer_data(customer_id: str):
 # ============================================================================
 # This is how you'd use the final solution in production
 
-def example_usage():
+async def example_usage():
     """
     Example of how to use the production-ready solution.
 
     The handle_support_request function uses get_customer_data internally,
     which applies all 5 fixes automatically.
+
+    Run it with: asyncio.run(example_usage())
     """
 
     # Your agent implementation would go here
@@ -381,7 +760,7 @@ def example_usage():
     agent = MockAgent()
 
     # This call is now production-ready with all protections
-    response = handle_support_request(
+    response = await handle_support_request(
         user_message="I need help with my account",
         customer_id="user_123",
         agent=agent
@@ -4,6 +4,7 @@ Deterministic assignment ensures users get consistent variants.
 """
 
 import hashlib
+from functools import lru_cache
 from typing import Dict, Literal, Optional
 
 
@@ -27,6 +28,10 @@ class ABTestManager:
                 "sample_size_target": 1000  # per variant
             }
         }
+        
+        # Assignment is deterministic per (agent, user), so remember it instead
+        # of hashing on every call. Cleared whenever the tests change
+        self._version_cache = lru_cache(maxsize=10_000)(self._resolve_prompt_version)
     
     def get_variant(self, test_id: str, user_id: str) -> str:
         """
@@ -71,6 +76,10 @@ class ABTestManager:
         Returns:
             Prompt version string (e.g., "v1.0.0" or "current")
         """
+        return self._version_cache(agent_name, user_id)
+    
+    def _resolve_prompt_version(self, agent_name: str, user_id: str) -> str:
+        """Uncached get_prompt_version."""
         if agent_name not in self.active_tests:
             return "current"  # No active test
         
@@ -106,8 +115,14 @@ class ABTestManager:
             "start_date": None,  # Set when test starts
             "sample_size_target": 1000
         }
+        self.clear_cache()
     
     def disable_test(self, agent_name: str):
         """Disable an active test (fall back to 'current' version)."""
         if agent_name in self.active_tests:
             del self.active_tests[agent_name]
+            self.clear_cache()
+    
+    def clear_cache(self):
+        """Forget memoized assignments (call after editing active_tests directly)."""
+        self._version_cache.cache_clear()
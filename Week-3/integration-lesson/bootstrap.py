@@ -0,0 +1,47 @@
+"""
+Bootstrap - process-wide setup shared by main.py and main_v2.py.
+Loads .env once and owns the shared LLM clients, so every module imports
+already-built clients instead of constructing (and pooling) its own.
+
+This mirrors llm_clients.py at the repo root rather than importing it: the
+integration lesson is run from its own directory (python main.py) and the
+repo root is not a package / not on sys.path, and its pool is sized for the
+concurrent ticket fan-out rather than for one-off scripts.
+"""
+
+from functools import lru_cache
+
+import httpx
+from dotenv import load_dotenv
+from langchain_openai import ChatOpenAI
+
+# Python runs this module body once per process (see sys.modules), so every
+# importer shares this single load_dotenv() call
+load_dotenv()
+
+# One connection pool for every client, sized for the asyncio.gather fan-out
+# in main.py (sync client for main_v2.py's .invoke() calls)
+_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+http_client = httpx.Client(limits=_LIMITS)
+http_async_client = httpx.AsyncClient(limits=_LIMITS)
+
+
+def get_chat_model(*, model: str, temperature: float) -> ChatOpenAI:
+    """Return the process-wide ChatOpenAI client for this model/temperature."""
+    return _chat_model(model, float(temperature))
+
+
+# Keyword-only arguments are normalized before hitting the cache, so every
+# spelling of a call shares one instance (same scheme as llm_clients.py)
+@lru_cache(maxsize=None)
+def _chat_model(model: str, temperature: float) -> ChatOpenAI:
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+
+NANO = get_chat_model(model="gpt-4.1-nano", temperature=0.6)
+MINI = get_chat_model(model="gpt-4.1-mini", temperature=0.6)
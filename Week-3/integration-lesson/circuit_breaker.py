@@ -73,6 +73,46 @@ class CircuitBreaker:
             CircuitBreakerOpen: If circuit is open and timeout hasn't elapsed
             Exception: Whatever exception func raises
         """
+        self._before_call()
+        
+        # Try the function call
+        try:
+            result = func()
+        except Exception as e:
+            self._on_failure()
+            # Re-raise the exception
+            raise e
+        
+        self._on_success()
+        return result
+    
+    async def acall(self, func):
+        """
+        Async version of call() - awaits func() inside the breaker.
+        
+        Args:
+            func: Function returning an awaitable (e.g. lambda: llm.ainvoke(messages))
+        
+        Returns:
+            Result from func if successful
+        
+        Raises:
+            CircuitBreakerOpen: If circuit is open and timeout hasn't elapsed
+            Exception: Whatever exception func raises
+        """
+        self._before_call()
+        
+        try:
+            result = await func()
+        except Exception as e:
+            self._on_failure()
+            raise e
+        
+        self._on_success()
+        return result
+    
+    def _before_call(self):
+        """Fail fast if the circuit is open, or move to HALF_OPEN after the timeout."""
         # Check if circuit is open
         if self.state == CircuitState.OPEN:
             # Has enough time passed to try again?
@@ -87,36 +127,29 @@ class CircuitBreaker:
                     f"Circuit breaker open. Tried {self.failures} times. "
                     f"Wait {wait_time:.0f}s"
                 )
+    
+    def _on_success(self):
+        """Success! Reset failure counter."""
+        if self.state == CircuitState.HALF_OPEN:
+            # We recovered! Close the circuit
+            logger.info("Circuit breaker recovered, moving to CLOSED")
+            self.state = CircuitState.CLOSED
         
-        # Try the function call
-        try:
-            result = func()
-            
-            # Success! Reset failure counter
-            if self.state == CircuitState.HALF_OPEN:
-                # We recovered! Close the circuit
-                logger.info("Circuit breaker recovered, moving to CLOSED")
-                self.state = CircuitState.CLOSED
-            
-            self.failures = 0
-            return result
-            
-        except Exception as e:
-            # Failure! Increment counter
-            self.failures += 1
-            self.last_failure_time = time.time()
-            
-            # Check if we should open the circuit
-            if self.failures >= self.max_failures:
-                logger.warning(f"Circuit breaker opening after {self.failures} failures")
-                self.state = CircuitState.OPEN
-            elif self.state == CircuitState.HALF_OPEN:
-                # Half-open test failed, reopen
-                logger.warning("Circuit breaker half-open test failed, reopening")
-                self.state = CircuitState.OPEN
-            
-            # Re-raise the exception
-            raise e
+        self.failures = 0
+    
+    def _on_failure(self):
+        """Failure! Increment counter and open the circuit if needed."""
+        self.failures += 1
+        self.last_failure_time = time.time()
+        
+        # Check if we should open the circuit
+        if self.failures >= self.max_failures:
+            logger.warning(f"Circuit breaker opening after {self.failures} failures")
+            self.state = CircuitState.OPEN
+        elif self.state == CircuitState.HALF_OPEN:
+            # Half-open test failed, reopen
+            logger.warning("Circuit breaker half-open test failed, reopening")
+            self.state = CircuitState.OPEN
     
     def reset(self):
         """
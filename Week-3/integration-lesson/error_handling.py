@@ -3,6 +3,8 @@ Error Handling - Retry logic with exponential backoff.
 Handles transient failures gracefully using LangChain patterns.
 """
 
+import asyncio
+import inspect
 import time
 import logging
 from functools import wraps
@@ -48,10 +50,42 @@ def retry_with_backoff(
         def call_llm(messages):
             return llm.invoke(messages)
     
+    Works on both regular and async functions - async functions are awaited
+    and back off with asyncio.sleep instead of blocking the event loop.
+    
     Note: This works with LangChain's exception hierarchy. For production,
     consider using LangChain's built-in retry mechanism via RunnableRetry.
     """
     def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs) -> Any:
+                delay = initial_delay
+
+                for attempt in range(max_retries + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        if attempt == max_retries:
+                            logger.error(
+                                f"{func.__name__} failed after {max_retries} retries",
+                                exc_info=True
+                            )
+                            raise
+
+                        logger.warning(
+                            f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}), "
+                            f"retrying in {delay}s: {str(e)}"
+                        )
+
+                        # Non-blocking wait - other coroutines keep running
+                        await asyncio.sleep(delay)
+                        delay *= backoff_factor
+
+                raise Exception("Retry logic failed unexpectedly")
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
             delay = initial_delay
@@ -3,8 +3,11 @@ Structured Logging - JSON-formatted logs for production debugging.
 Makes it easy to search and analyze logs in Datadog/CloudWatch.
 """
 
+import atexit
 import logging
+import logging.handlers
 import json
+import queue
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -17,6 +20,43 @@ class JSONFormatter(logging.Formatter):
         return record.getMessage()
 
 
+def get_queued_logger(
+    name: str,
+    level: int = logging.INFO,
+    formatter: Optional[logging.Formatter] = None
+) -> logging.Logger:
+    """
+    Get a logger whose records are written by a background thread.
+    
+    logger.info() only puts the record on a queue, so a coroutine logging in
+    the hot path never blocks on stdout. A QueueListener thread does the
+    actual write and is flushed/stopped at interpreter exit.
+    
+    Args:
+        name: Logger name
+        level: Minimum level to emit
+        formatter: Formatter for the written records (default: message only)
+    
+    Returns:
+        Configured logger (the same one on repeated calls)
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+        return logger
+    
+    log_queue = queue.Queue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(formatter or logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    return logger
+
+
 class StructuredLogger:
     """
     Structured logger for agent calls.
@@ -30,13 +70,8 @@ class StructuredLogger:
         Args:
             name: Logger name
         """
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(logging.INFO)
-        
-        # Console handler with JSON formatter
-        handler = logging.StreamHandler()
-        handler.setFormatter(JSONFormatter())
-        self.logger.addHandler(handler)
+        # Queued JSON output - log_agent_call never blocks the caller on stdout
+        self.logger = get_queued_logger(name, formatter=JSONFormatter())
     
     def log_agent_call(
         self,
@@ -86,6 +121,8 @@ class StructuredLogger:
                 log_entry["requires_approval"] = response.requires_approval
             if hasattr(response, 'cost'):
                 log_entry["cost_usd"] = response.cost
+            if hasattr(response, 'routings'):
+                log_entry["routings"] = [routing.specialist for routing in response.routings]
         else:
             log_entry["error"] = error
         
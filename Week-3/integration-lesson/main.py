@@ -1,37 +1,43 @@
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from bootstrap import NANO, MINI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 from pydantic import BaseModel, Field
-from typing import TypedDict, Literal, Optional
+from typing import TypedDict, Literal, Optional, Annotated
 from prompt_manager import PromptManager
 from ab_test_manager import ABTestManager
 from pathlib import Path
-from models import TicketRouting, SupportResponse
+from models import TicketRouting, TicketRoutingBatch, SupportResponse
 from error_handling import retry_with_backoff
 from circuit_breaker import CircuitBreaker, CircuitBreakerOpen
-from logging_config import StructuredLogger
+from logging_config import StructuredLogger, get_queued_logger
 from cost_tracker import CostTracker
 from rate_limiter import RateLimiter
 from input_sanitizer import InputSanitizer
 from output_validator import OutputValidator
+import asyncio
+import operator
+import re
 import time
-load_dotenv()
+from types import MappingProxyType
 
 prompt_manager = PromptManager(prompts_dir=str(Path(__file__).parent / "prompts"))
 ab_test_manager = ABTestManager()
 cost_tracker = CostTracker()
 rate_limiter = RateLimiter()
 logger = StructuredLogger("customer_support_agent")
+agent_logger = get_queued_logger("agent") # node progress - queued so nodes never block on stdout
 input_sanitizer = InputSanitizer()
 output_validator = OutputValidator(allowed_emails=["support@techcorp.com"])
-# initialize the circuit breaker for each agent
+# initialize the circuit breaker for each agent (specialists own theirs - see SpecialistAgent)
 
 supervisor_circuit_breaker = CircuitBreaker(max_failures=3, timeout=60)
-billing_circuit_breaker = CircuitBreaker(max_failures=3, timeout=60)
-technical_circuit_breaker = CircuitBreaker(max_failures=3, timeout=60)
-general_circuit_breaker = CircuitBreaker(max_failures=3, timeout=60)
-escalate_circuit_breaker = CircuitBreaker(max_failures=3, timeout=60)
+# separate breaker for batch routing - a malformed batch must not trip the per-ticket fallback's breaker
+supervisor_batch_circuit_breaker = CircuitBreaker(max_failures=3, timeout=60)
+
+# Shared LLM clients (built in bootstrap) - one per model for every agent, so
+# concurrent ticket flows reuse the same connection pool
+_CLIENTS = {"gpt-4.1-nano": NANO, "gpt-4.1-mini": MINI}
 
 #Load the Prompt 
 def load_prompt_with_fallback(agent_name:str, user_id: str):
@@ -61,83 +67,120 @@ class AgentState(TypedDict):
     routing_reasoning: str
     response: str
     specialist_used: str
-    iteration_count: int
-    log_trace: list
+    iteration_count: Annotated[int, operator.add] # each node adds 1 - correct even when specialists run in parallel
+    # Reducer: each node returns only its own entries and LangGraph appends them,
+    # instead of every node copying the whole trace to add one item
+    log_trace: Annotated[list, operator.add]
+    # Specialist answers - a list reducer so parallel branches (see fan_out) can
+    # all write to it in the same step; choose_best picks the final response
+    candidates: Annotated[list, operator.add]
     sanitized_ticket: str
     prompt_version: str
     tokens_used: Optional[int]
     cost: Optional[float]
     error: Optional[str]
+    pre_checked: bool # guards already ran in pre_route() - error / sanitized_ticket hold the outcome
+    pre_routed: bool # routing already filled in by pre_route() - supervisor skips its LLM call
 
 # Bad Practice: Updating the state directly
 # state["user_id"] = "123456"  # not recommmended
 # return {"user_id": "123456"} # this is the correct way to update the state
 # Agents
 
-# Define each class for new agents - 
-# The reason, 
-# The response is different for each agent - so we need to define a new class for each agent
-# The specialist is different for each agent - so we need to define a new class for each agent
-# The iteration count is different for each agent - so we need to define a new class for each agent
-# The log trace is different for each agent - so we need to define a new class for each agent
+# The supervisor has its own class (different output schema and prompt flow).
+# The specialists only differ in name (prompt key) and model, so they share
+# one SpecialistAgent class - see the SPECIALISTS registry below
+
+# Keyword pre-router - obvious tickets are routed without an LLM call.
+# Compiled once at import
+_KEYWORDS = {
+    "billing": re.compile(r"\b(?:charged?|invoices?|refunds?|subscriptions?|payments?|billing|billed|orders?)\b", re.I),
+    "technical": re.compile(r"\b(?:api|errors?|bugs?|crash(?:es|ed)?|integrat(?:e|ion)|gateway|timeouts?)\b", re.I),
+    "general": re.compile(r"\b(?:password|reset|account|log ?in|forgot)\b", re.I),
+    "escalate": re.compile(r"\b(?:sue|lawyers?|legal|lawsuit|court|attorney)\b", re.I),
+}
+KEYWORD_MIN_HITS = 2 # a single keyword is too weak a signal to skip the LLM
+
+def keyword_route(ticket: str) -> Optional[TicketRouting]:
+    """ Route the ticket by keywords if exactly one specialist matches (with enough hits), else None """
+    hits = {name: len(pattern.findall(ticket)) for name, pattern in _KEYWORDS.items()}
+    matched = [name for name, count in hits.items() if count]
+    if len(matched) != 1 or hits[matched[0]] < KEYWORD_MIN_HITS:
+        return None
+    return TicketRouting(specialist=matched[0], reasoning="keyword-match", confidence=0.95)
+
+def run_guards(ticket: str, user_id: str) -> tuple[Optional[str], str, bool]:
+    """
+    Rate limit, budget and sanitization checks - run once per ticket, before any LLM call
+    Returns:
+        (error, sanitized_ticket, is_suspicious) - error is None if the ticket may proceed
+    """
+    allowed, retry_after = rate_limiter.check_rate_limit(user_id,
+    max_requests=10,
+    window_seconds=60
+    )
+
+    if not allowed:
+        return f"Rate limit exceeded. Retry after {retry_after}s", ticket, False
+    
+    if not cost_tracker.check_budget(user_id, daily_limit=1.0):
+        return "Daily budget exceeded", ticket, False
+
+    # Sanitize the input
+    sanitized_ticket, is_suspicious = input_sanitizer.sanitize(ticket)
+    if is_suspicious:
+        logger.logger.warning(f"Suspicious input from {user_id}: {ticket[:100]}")
+    return None, sanitized_ticket, is_suspicious
 
 class SupervisorAgent:
     """ Supervisor Agent """
 
     def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4.1-nano", temperature=0.6).with_structured_output(TicketRouting)
+        self.llm = NANO.with_structured_output(TicketRouting)
+        self.batch_llm = NANO.with_structured_output(TicketRoutingBatch)
     # Use the cheapest model for this agent
 
-    @retry_with_backoff(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
-    def route(self, ticket: str, user_id: str) :
-        """ Route the ticket to the appropriate specialist """
+    @retry_with_backoff(max_retries=1, initial_delay=1.0, backoff_factor=2.0) # per-ticket routing is the fallback, don't wait long
+    async def route_batch(self, tickets: list[str], user_id: str) -> list[TicketRouting]:
+        """ Route several tickets with a single LLM call """
         prompt_data, prompt_version = load_prompt_with_fallback("supervisor", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
-        start_time = time.time() # track the time taken to route the ticket
+        compiled_prompt = prompt_manager.compile_prompt(prompt_data) # same static prompt as route()
+        numbered = "\n".join(f"{i}. {ticket}" for i, ticket in enumerate(tickets, 1))
+        start_time = time.time()
         try:
             messages = [
                 SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
+                HumanMessage(content=f"Route each of the following {len(tickets)} tickets independently. "
+                                     f"Return exactly one routing per ticket, with its ticket_number set to the ticket's number.\n\nTickets:\n{numbered}")
             ]
-            
-            routing = supervisor_circuit_breaker.call(lambda: self.llm.invoke(messages))
+
+            batch = await supervisor_batch_circuit_breaker.acall(lambda: self.batch_llm.ainvoke(messages))
+            # Map by ticket number, not position - a skipped or duplicated ticket would shift every routing after it
+            by_number = {routing.ticket_number: routing for routing in batch.routings}
+            expected = list(range(1, len(tickets) + 1))
+            if len(batch.routings) != len(tickets) or sorted(by_number) != expected:
+                raise ValueError(f"Expected routings for tickets {expected}, got {[r.ticket_number for r in batch.routings]}")
             latency_ms = (time.time() - start_time) * 1000
             logger.log_agent_call(
                 user_id=user_id,
                 agent_name="supervisor",
                 prompt_version=prompt_version,
-                user_message=ticket,
-                response=routing,
-                tokens_used=0, # we don't know the tokens used yet because we are using the structured output
+                user_message=numbered,
+                response=batch,
+                tokens_used=0,
                 latency_ms=latency_ms,
                 success=True,
                 error=None
             )
-            return routing
-        except CircuitBreakerOpen as e:
-            print(f"Circuit Breaker Open: {e}")
-            latency_ms = (time.time() - start_time) * 1000
-            logger.log_agent_call(
-                user_id=user_id,
-                agent_name="supervisor",
-                prompt_version=prompt_version,
-                user_message=ticket,
-                response=None,
-                tokens_used=0,
-                latency_ms=latency_ms,
-                success=False,
-                error=str(e)
-            )
-            raise 
-        
+            return [by_number[number] for number in expected]
         except Exception as e:
-            print(f"Error: {e}")
+            agent_logger.error(f"Batch routing error: {e}")
             latency_ms = (time.time() - start_time) * 1000
             logger.log_agent_call(
                 user_id=user_id,
                 agent_name="supervisor",
                 prompt_version=prompt_version,
-                user_message=ticket,
+                user_message=numbered,
                 response=None,
                 tokens_used=0,
                 latency_ms=latency_ms,
@@ -146,46 +189,38 @@ class SupervisorAgent:
             )
             raise
 
-
-class BillingAgent:
-    """ Billing Agent """
-
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.6).with_structured_output(SupportResponse)
-    # Use the cheapest model for this agent
-
     @retry_with_backoff(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
-    def handle(self, ticket: str, user_id: str) -> str : # Enhance the readability of the code by using the return type
-        """ Handle the Billing related ticket"""
-        prompt_data, prompt_version = load_prompt_with_fallback("billing", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
-        start_time = time.time()
+    async def route(self, ticket: str, user_id: str) :
+        """ Route the ticket to the appropriate specialist """
+        prompt_data, prompt_version = load_prompt_with_fallback("supervisor", user_id)
+        compiled_prompt = prompt_manager.compile_prompt(prompt_data) # static - ticket goes in the HumanMessage
+        start_time = time.time() # track the time taken to route the ticket
         try:
             messages = [
                 SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
+                HumanMessage(content=f"Ticket: {ticket}")
             ]
-
-            response = billing_circuit_breaker.call(lambda: self.llm.invoke(messages))
+            
+            routing = await supervisor_circuit_breaker.acall(lambda: self.llm.ainvoke(messages))
             latency_ms = (time.time() - start_time) * 1000
             logger.log_agent_call(
                 user_id=user_id,
-                agent_name="billing",
+                agent_name="supervisor",
                 prompt_version=prompt_version,
                 user_message=ticket,
-                response=response,
-                tokens_used=0,
+                response=routing,
+                tokens_used=0, # we don't know the tokens used yet because we are using the structured output
                 latency_ms=latency_ms,
                 success=True,
                 error=None
             )
-            return response
+            return routing
         except CircuitBreakerOpen as e:
-            print(f"Circuit Breaker Open: {e}")
+            agent_logger.warning(f"Circuit Breaker Open: {e}")
             latency_ms = (time.time() - start_time) * 1000
             logger.log_agent_call(
                 user_id=user_id,
-                agent_name="billing",
+                agent_name="supervisor",
                 prompt_version=prompt_version,
                 user_message=ticket,
                 response=None,
@@ -197,11 +232,11 @@ class BillingAgent:
             raise 
         
         except Exception as e:
-            print(f"Error: {e}")
+            agent_logger.error(f"Error: {e}")
             latency_ms = (time.time() - start_time) * 1000
             logger.log_agent_call(
                 user_id=user_id,
-                agent_name="billing",
+                agent_name="supervisor",
                 prompt_version=prompt_version,
                 user_message=ticket,
                 response=None,
@@ -213,92 +248,31 @@ class BillingAgent:
             raise
 
 
-class TechnicalAgent:
-    """ Technical Agent """
-
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4.1-mini", temperature=0.6).with_structured_output(SupportResponse)
-
-    @retry_with_backoff(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
-    def handle(self, ticket: str, user_id: str) -> str :
-        """ Handle the Technical related ticket"""
-        prompt_data, prompt_version = load_prompt_with_fallback("technical", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
-        start_time = time.time()
-
-        try:
-            messages = [
-            SystemMessage(content=compiled_prompt),
-            HumanMessage(content=ticket)
-        ]
-            response = technical_circuit_breaker.call(lambda: self.llm.invoke(messages))
-            latency_ms = (time.time() - start_time) * 1000
-            logger.log_agent_call(
-                user_id=user_id,
-                agent_name="technical",
-                prompt_version=prompt_version,
-                user_message=ticket,
-                response=response,
-                tokens_used=0,
-                latency_ms=latency_ms,
-                success=True,
-                error=None
-            )
-            return response
-        except CircuitBreakerOpen as e:
-            print(f"Circuit Breaker Open: {e}")
-            latency_ms = (time.time() - start_time) * 1000
-            logger.log_agent_call(
-                user_id=user_id,
-                agent_name="technical",
-                prompt_version=prompt_version,
-                user_message=ticket,
-                response=None,
-                tokens_used=0,
-                latency_ms=latency_ms,
-                success=False,
-                error=str(e)
-            )
-            raise 
-        
-        except Exception as e:
-            print(f"Error: {e}")
-            latency_ms = (time.time() - start_time) * 1000
-            logger.log_agent_call(
-                user_id=user_id,
-                agent_name="technical",
-                prompt_version=prompt_version,
-                user_message=ticket,
-                response=None,
-                tokens_used=0,
-                latency_ms=latency_ms,
-                success=False,
-                error=str(e)
-            )
-            raise
-
-class GeneralAgent:
-    """ General Agent """
+class SpecialistAgent:
+    """ Specialist Agent - billing, technical, general or escalate, depending on name """
 
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4.1-nano", temperature=0.6).with_structured_output(SupportResponse)
+    def __init__(self, name: str, model: str):
+        self.name = name
+        self.llm = _CLIENTS[model].with_structured_output(SupportResponse)
+        self.circuit_breaker = CircuitBreaker(max_failures=3, timeout=60)
 
     @retry_with_backoff(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
-    def handle(self, ticket: str,user_id: str) -> str :
-        """ Handle the General related ticket"""
-        prompt_data, prompt_version = load_prompt_with_fallback("general", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
+    async def handle(self, ticket: str, user_id: str) -> SupportResponse :
+        """ Handle the ticket with this specialist's prompt """
+        prompt_data, prompt_version = load_prompt_with_fallback(self.name, user_id)
+        compiled_prompt = prompt_manager.compile_prompt(prompt_data) # static - ticket goes in the HumanMessage
         start_time = time.time()
         try:
             messages = [
                 SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
+                HumanMessage(content=f"Ticket: {ticket}")
             ]
-            response = general_circuit_breaker.call(lambda: self.llm.invoke(messages))
+
+            response = await self.circuit_breaker.acall(lambda: self.llm.ainvoke(messages))
             latency_ms = (time.time() - start_time) * 1000
             logger.log_agent_call(
                 user_id=user_id,
-                agent_name="general",
+                agent_name=self.name,
                 prompt_version=prompt_version,
                 user_message=ticket,
                 response=response,
@@ -309,11 +283,11 @@ class GeneralAgent:
             )
             return response
         except CircuitBreakerOpen as e:
-            print(f"Circuit Breaker Open: {e}")
+            agent_logger.warning(f"Circuit Breaker Open: {e}")
             latency_ms = (time.time() - start_time) * 1000
             logger.log_agent_call(
                 user_id=user_id,
-                agent_name="general",
+                agent_name=self.name,
                 prompt_version=prompt_version,
                 user_message=ticket,
                 response=None,
@@ -325,11 +299,11 @@ class GeneralAgent:
             raise 
         
         except Exception as e:
-            print(f"Error: {e}")
+            agent_logger.error(f"Error: {e}")
             latency_ms = (time.time() - start_time) * 1000
             logger.log_agent_call(
                 user_id=user_id,
-                agent_name="general",
+                agent_name=self.name,
                 prompt_version=prompt_version,
                 user_message=ticket,
                 response=None,
@@ -340,68 +314,20 @@ class GeneralAgent:
             )
             raise
 
-class EscalateAgent:
-    """ Escalate Agent """
+# Adding a specialist = one line here + a prompts/<name>/ directory
+SPECIALISTS = {
+    "billing": SpecialistAgent("billing", "gpt-4.1-mini"),
+    "technical": SpecialistAgent("technical", "gpt-4.1-mini"),
+    "general": SpecialistAgent("general", "gpt-4.1-nano"), # Use the cheapest model for these agents
+    "escalate": SpecialistAgent("escalate", "gpt-4.1-nano"),
+}
 
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4.1-nano", temperature=0.6).with_structured_output(SupportResponse)
+FAN_OUT_CONFIDENCE = 0.6 # below this the supervisor's pick is ambiguous - ask a second specialist in parallel
+FALLBACK_SPECIALIST = "general"
+# Routed here, a ticket needs human review - low confidence is expected, so it is
+# never fanned out and never overridden by a more confident automated answer
+ESCALATE_SPECIALIST = "escalate"
 
-    @retry_with_backoff(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
-    def handle(self, ticket: str,user_id: str) -> str :
-        """ Handle the Escalate related ticket"""
-        prompt_data, prompt_version = load_prompt_with_fallback("escalate", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
-        start_time = time.time()
-        try:
-            messages = [
-                SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
-            ]
-            response = escalate_circuit_breaker.call(lambda: self.llm.invoke(messages))
-            latency_ms = (time.time() - start_time) * 1000
-            logger.log_agent_call(
-                user_id=user_id,
-                agent_name="escalate",
-                prompt_version=prompt_version,
-                user_message=ticket,
-                response=response,
-                tokens_used=0,
-                latency_ms=latency_ms,
-                success=True,
-                error=None
-            )
-            return response
-        except CircuitBreakerOpen as e:
-            print(f"Circuit Breaker Open: {e}")
-            latency_ms = (time.time() - start_time) * 1000
-            logger.log_agent_call(
-                user_id=user_id,
-                agent_name="escalate",
-                prompt_version=prompt_version,
-                user_message=ticket,
-                response=None,
-                tokens_used=0,
-                latency_ms=latency_ms,
-                success=False,
-                error=str(e)
-            )
-            raise 
-        
-        except Exception as e:
-            print(f"Error: {e}")
-            latency_ms = (time.time() - start_time) * 1000
-            logger.log_agent_call(
-                user_id=user_id,
-                agent_name="escalate",
-                prompt_version=prompt_version,
-                user_message=ticket,
-                response=None,
-                tokens_used=0,
-                latency_ms=latency_ms,
-                success=False,
-                error=str(e)
-            )
-            raise
 # Steps to create the graph:
 # 1. Initialize the StateGraph
 # 2. Add the nodes for each agent
@@ -409,15 +335,12 @@ class EscalateAgent:
 # 4. Compile the graph
 # 5. Run the graph
 
-def create_simple_graph(supervisor, billing, technical, general, escalate):
+def create_simple_graph(supervisor, specialists):
     """
     Create a simple graph for the ticket routing system
     Args:
         supervisor: SupervisorAgent
-        billing: BillingAgent
-        technical: TechnicalAgent
-        general: GeneralAgent
-        escalate: EscalateAgent
+        specialists: dict of node name -> SpecialistAgent (e.g. SPECIALISTS)
     Returns:
         workflow: StateGraph
 
@@ -426,38 +349,40 @@ def create_simple_graph(supervisor, billing, technical, general, escalate):
     workflow = StateGraph(AgentState)
 
     # Supervisor Node
-    def supervisor_node(state: AgentState) -> AgentState:
+    async def supervisor_node(state: AgentState) -> AgentState:
         """ Supervisor Node """
-        print("Supervisor Node: Analyzing the ticket")
+        agent_logger.info("Supervisor Node: Analyzing the ticket")
         try:
-            # check the Rate Limit
-            start_time = time.time()
-            allowed, retry_after = rate_limiter.check_rate_limit(state["user_id"],
-            max_requests=10,
-            window_seconds=60
-            )
-
-            if not allowed:
-                return {"error": f"Rate limit exceeded. Retry after {retry_after}s"}
-            
-            if not cost_tracker.check_budget(state["user_id"], daily_limit=1.0):
-                return {"error": "Daily budget exceeded"}
-
-            # Sanitize the input
-            sanitized_ticket, is_suspicious = input_sanitizer.sanitize(state["ticket"])
-            if is_suspicious:
-                logger.logger.warning(f"Suspicious input from {state['user_id']}: {state['ticket'][:100]}")
-            
-
-
-            routing = supervisor.route(sanitized_ticket,state["user_id"])
-            print(f"Routed to {routing.specialist} with confidence {routing.confidence} and reasoning {routing.reasoning}")
+            if state.get("pre_checked"):
+                # pre_route() already ran the guards - running them again would
+                # count this ticket against the rate limit twice
+                if state.get("error"):
+                    return {"error": state["error"]}
+                sanitized_ticket = state["sanitized_ticket"]
+            else:
+                error, sanitized_ticket, _ = run_guards(state["ticket"], state["user_id"])
+                if error:
+                    return {"error": error}
+
+            if state.get("pre_routed"):
+                # routed up front by pre_route()
+                routing = TicketRouting(
+                    specialist=state["specialist"],
+                    confidence=state["routing_confidence"],
+                    reasoning=state["routing_reasoning"]
+                )
+            else:
+                # cheap keyword match first - only ambiguous tickets cost an LLM call
+                routing = keyword_route(sanitized_ticket)
+                if routing is None:
+                    routing = await supervisor.route(sanitized_ticket,state["user_id"])
+            agent_logger.info(f"Routed to {routing.specialist} with confidence {routing.confidence} and reasoning {routing.reasoning}")
             return {
                 "specialist": routing.specialist,
                 "routing_confidence": routing.confidence,
                 "routing_reasoning": routing.reasoning,
-                "iteration_count": state.get("iteration_count", 0) + 1,
-                "log_trace": state.get("log_trace", []) + [{
+                "iteration_count": 1,
+                "log_trace": [{
                     "agent": "supervisor",
                     "action": "routing",
                     "specialist": routing.specialist,
@@ -471,147 +396,153 @@ def create_simple_graph(supervisor, billing, technical, general, escalate):
 
     workflow.add_node("supervisor", supervisor_node)
 
-    # Billing Node
-    def billing_node(state: AgentState) -> AgentState:
-        """ Billing Node """
-        print("Billing Node: Handling the ticket")
-        try:
-            response = billing.handle(state["ticket"],state["user_id"])
-            #print(f"Handled the ticket with response {state['response']}")
-            # validate the output
-            is_valid, error = output_validator.validate(response.message, state["user_email"],action=response.action, requires_approval=response.requires_approval)
-            if not is_valid:
-                logger.logger.error(f"Billing Node Error, Output validation failed: {error}")
-                return {"error": error}
-            # update the state
-            return {
-                "response": response.message,
-                "specialist_used": "billing",
-                "iteration_count": state.get("iteration_count", 0) + 1,
-                "log_trace": state.get("log_trace", []) + [{
-                    "agent": "billing",
-                    "action": "handling",
-                    "response": response.message
-                }]
-            }
-        except Exception as e:
-            logger.logger.error(f"Billing Node Error: {e}")
-            return {"error": str(e)}
-
-    workflow.add_node("billing", billing_node)
-
-    # Technical Node
-    def technical_node(state: AgentState) -> AgentState:
-        """ Technical Node """
-        print("Technical Node: Handling the ticket")
-        try:
-            response = technical.handle(state["ticket"],state["user_id"])
-            # validate the output
-            is_valid, error = output_validator.validate(response.message, state["user_email"],action=response.action, requires_approval=response.requires_approval)
-            if not is_valid:
-                logger.logger.error(f"Technical Node Error, Output validation failed: {error}")
-                return {"error": error}
-            # update the state
-            return {
-                "response": response.message,
-                "specialist_used": "technical",
-                "iteration_count": state.get("iteration_count", 0) + 1,
-                "log_trace": state.get("log_trace", []) + [{
-                    "agent": "technical",
-                    "action": "handling",
-                    "response": response.message
-                }]
-            }
-        except Exception as e:
-            logger.logger.error(f"Technical Node Error: {e}")
-            return {"error": str(e)}
-    workflow.add_node("technical", technical_node)
-
-    # General Node
-    def general_node(state: AgentState) -> AgentState:
-        """ General Node """
-        print("General Node: Handling the ticket")
-        try:
-            response = general.handle(state["ticket"],state["user_id"])
-            # validate the output
-            is_valid, error = output_validator.validate(response.message, state["user_email"],action=response.action, requires_approval=response.requires_approval)
-            if not is_valid:
-                logger.logger.error(f"General Node Error, Output validation failed: {error}")
-                return {"error": error}
-            # update the state
-            return {
-                "response": response.message,
-                "specialist_used": "general",
-                "iteration_count": state.get("iteration_count", 0) + 1,
-                "log_trace": state.get("log_trace", []) + [{
-                    "agent": "general",
-                    "action": "handling",
-                    "response": response.message
-                }]
-            }
-        except Exception as e:
-            logger.logger.error(f"General Node Error: {e}")
-            return {"error": str(e)}
-
-    workflow.add_node("general", general_node)
-
-    # Escalate Node
-    def escalate_node(state: AgentState) -> AgentState:
-        """ Escalate Node """
-        print("Escalate Node: Escalating the ticket")
-        try:
-            response = escalate.handle(state["ticket"],state["user_id"])
-            # validate the output
-            is_valid, error = output_validator.validate(response.message, state["user_email"],action=response.action, requires_approval=response.requires_approval)
-            if not is_valid:
-                logger.logger.error(f"Escalate Node Error, Output validation failed: {error}")
-                return {"error": error}
-            # update the state
-            return {
-                "response": response.message,
-                "specialist_used": "escalate",
-                "iteration_count": state.get("iteration_count", 0) + 1,
-                "log_trace": state.get("log_trace", []) + [{
-                    "agent": "escalate",
-                    "action": "handling",
-                    "response": response.message
-                }]
-            }
-        except Exception as e:
-            logger.logger.error(f"Escalate Node Error: {e}")
-            return {"error": str(e)}
+    # Specialist Nodes - one per registry entry, built by the same factory
+    def make_node(name: str, agent: SpecialistAgent):
+        """ Build the node function for one specialist """
+        async def specialist_node(state: AgentState) -> AgentState:
+            agent_logger.info(f"{name.capitalize()} Node: Handling the ticket")
+            try:
+                response = await agent.handle(state["ticket"],state["user_id"])
+                # validate the output
+                is_valid, error = output_validator.validate(response.message, state.get("user_email", ""),action=response.action, requires_approval=response.requires_approval)
+                if not is_valid:
+                    logger.logger.error(f"{name.capitalize()} Node Error, Output validation failed: {error}")
+                    return {"candidates": [{"specialist": name, "error": error}], "iteration_count": 1}
+                # update the state - reducer keys only, this node may run in parallel with another specialist
+                return {
+                    "candidates": [{
+                        "specialist": name,
+                        "response": response.message,
+                        "confidence": response.confidence,
+                        "error": None
+                    }],
+                    "log_trace": [{
+                        "agent": name,
+                        "action": "handling",
+                        "response": response.message
+                    }],
+                    "iteration_count": 1
+                }
+            except Exception as e:
+                logger.logger.error(f"{name.capitalize()} Node Error: {e}")
+                return {"candidates": [{"specialist": name, "error": str(e)}], "iteration_count": 1}
+        return specialist_node
+
+    for name, agent in specialists.items():
+        workflow.add_node(name, make_node(name, agent))
+
+    # Choose Best Node - merges the specialist branches into the final response
+    async def choose_best_node(state: AgentState) -> AgentState:
+        """ Choose Best Node """
+        candidates = state.get("candidates", [])
+        answered = [c for c in candidates if c["error"] is None]
+        if not answered:
+            return {"error": candidates[0]["error"] if candidates else "No specialist response"}
+        # an escalation always wins; otherwise the highest specialist confidence,
+        # ties keep the supervisor's pick (first in the list)
+        escalations = [c for c in answered if c["specialist"] == ESCALATE_SPECIALIST]
+        best = escalations[0] if escalations else max(answered, key=lambda c: c["confidence"])
+        if len(candidates) > 1:
+            agent_logger.info(f"Choose Best Node: {best['specialist']} with confidence {best['confidence']}")
+        return {
+            "response": best["response"],
+            "specialist_used": best["specialist"]
+        }
 
-    workflow.add_node("escalate", escalate_node)
+    workflow.add_node("choose_best", choose_best_node)
 
     # Add the edges for each agent - based on the routing decision
     # Build Graph Structure
     workflow.add_edge(START, "supervisor")
 
-    def routing_decision(state: AgentState) -> str:
-        """ Routing Decision """
-        return state["specialist"]
-
-    workflow.add_conditional_edges("supervisor", routing_decision, {
-        "billing": "billing",
-        "technical": "technical",
-        "general": "general",
-        "escalate": "escalate"
-    })
-    # Connect every specialist to the END node
-    workflow.add_edge("billing", END)
-    workflow.add_edge("technical", END)
-    workflow.add_edge("general", END)
-    workflow.add_edge("escalate", END)
+    # Targets for every (specialist, ambiguous) pair, built once with the graph
+    # so fan_out only does a lookup per ticket
+    fan_out_targets = {
+        (name, ambiguous): (name, FALLBACK_SPECIALIST) if ambiguous and name not in (FALLBACK_SPECIALIST, ESCALATE_SPECIALIST) else (name,)
+        for name in specialists
+        for ambiguous in (False, True)
+    }
+
+    def fan_out(state: AgentState):
+        """ Send the ticket to the routed specialist - and to the fallback as well when routing is ambiguous """
+        if state.get("error"):
+            # rejected by a guard (or routing failed) - don't spend specialist tokens on it
+            return END
+        targets = fan_out_targets[state["specialist"], state["routing_confidence"] < FAN_OUT_CONFIDENCE]
+        # one Send per target - the branches run in the same step, in parallel
+        return [Send(target, state) for target in targets]
+
+    workflow.add_conditional_edges("supervisor", fan_out, [*specialists, END])
+    # Every specialist feeds choose_best, which connects to the END node.
+    # choose_best runs once, after all the specialists sent to in this step finish
+    for name in specialists:
+        workflow.add_edge(name, "choose_best")
+    workflow.add_edge("choose_best", END)
     return workflow.compile()
 
-def main():
+MAX_CONCURRENT_TICKETS = 4 # stay within OpenAI rate limits
+
+# Keys shared by every test ticket - read-only, each run copies it and adds the ticket.
+# log_trace and iteration_count are left out: their reducers start from empty/0 on their own
+_INITIAL_STATE = MappingProxyType({
+    "user_id": "1234567890",
+    "specialist": "general", # default specialist
+    "routing_confidence": 0.0,
+    "routing_reasoning": "",
+    "response": "",
+    "specialist_used": "",
+})
+
+async def pre_route(supervisor: SupervisorAgent, tickets: list[str], user_id: str) -> list[dict]:
+    """
+    Guard and route all tickets up front: run_guards() first, then keyword match,
+    then one batched LLM call for the rest instead of one call per ticket.
+    Tickets that fail a guard never reach the LLM; suspicious tickets are kept
+    out of the shared batch message (one injected ticket could steer the routing
+    of all the others) and are routed on their own by the supervisor node, as is
+    everything if the batch call fails.
+    Returns:
+        Initial-state overrides per ticket
+    """
+    overrides = []
+    pending = []
+    for i, ticket in enumerate(tickets):
+        error, sanitized_ticket, is_suspicious = run_guards(ticket, user_id)
+        override = {"pre_checked": True, "sanitized_ticket": sanitized_ticket}
+        overrides.append(override)
+        if error:
+            override["error"] = error
+            continue
+        routing = keyword_route(sanitized_ticket)
+        if routing is not None:
+            override["routing"] = routing
+        elif not is_suspicious:
+            pending.append(i)
+
+    if pending:
+        try:
+            batch = await supervisor.route_batch([overrides[i]["sanitized_ticket"] for i in pending], user_id)
+        except Exception as e:
+            agent_logger.warning(f"Batch routing failed, falling back to per-ticket routing: {e}")
+        else:
+            for i, routing in zip(pending, batch):
+                overrides[i]["routing"] = routing
+
+    for override in overrides:
+        routing = override.pop("routing", None)
+        if routing is not None:
+            override.update(
+                specialist=routing.specialist,
+                routing_confidence=routing.confidence,
+                routing_reasoning=routing.reasoning,
+                pre_routed=True
+            )
+    return overrides
+
+async def main():
     """ Main function """
     supervisor = SupervisorAgent()
-    billing = BillingAgent()
-    technical = TechnicalAgent()
-    general = GeneralAgent()
-    escalate = EscalateAgent()
-    graph = create_simple_graph(supervisor, billing, technical, general, escalate)
+    graph = create_simple_graph(supervisor, SPECIALISTS)
     
     test_cases = [
         "I was charged twice for my order# 12345",
@@ -621,31 +552,43 @@ def main():
         "API is returning 429 error",
         "I am going to sue you for $1000000"
     ]
-    results = []
-    for test_case in test_cases:
-        print(f"Testing: {test_case}")
-        initial_state = {
-            "ticket": test_case,
-            "user_id": "1234567890",
-            "specialist": "general", # default specialist
-            "routing_confidence": 0.0,
-            "routing_reasoning": "",
-            "response": "",
-            "specialist_used": "",
-            "iteration_count": 0,
-            "log_trace": []
-        }
-        result = graph.invoke(initial_state)
-        results.append(result)
+
+    # Guards, then one routing call for the whole batch instead of one per ticket
+    overrides = await pre_route(supervisor, test_cases, _INITIAL_STATE["user_id"])
+
+    # The tickets are independent, so run them concurrently - wall-clock is
+    # ~1 ticket's latency instead of the sum of all of them.
+    # The semaphore caps how many graphs talk to OpenAI at the same time.
+    sem = asyncio.Semaphore(MAX_CONCURRENT_TICKETS)
+
+    async def run_ticket(index: int, test_case: str, override: dict):
+        async with sem:
+            agent_logger.info(f"Testing: {test_case}")
+            initial_state = {**_INITIAL_STATE, **override, "ticket": test_case}
+            result = await graph.ainvoke(initial_state)
+            # Show each answer as soon as its ticket finishes - only the final,
+            # validated response (choose_best never picks a candidate that failed
+            # output_validator), never raw model tokens
+            print(f"[ticket {index}] {result['response'] or result.get('error', '')}", flush=True)
+            return result
+
+    results = await asyncio.gather(*[
+        run_ticket(i, test_case, override)
+        for i, (test_case, override) in enumerate(zip(test_cases, overrides), 1)
+    ])
+    print()
+
+    for test_case, result in zip(test_cases, results):
         # print(f"Result: {result}")
+        print(f"Ticket: {test_case}")
         print(f"Specialist used: {result['specialist_used']}")
         print(f"Response: {result['response']}")
         print(f"Routing confidence: {result['routing_confidence']}")
         print(f"Routing reasoning: {result['routing_reasoning']}")
-        print(f"Iteration count: {result['iteration_count']}")
-        print(f"Log trace: {result['log_trace']}")
+        print(f"Iteration count: {result.get('iteration_count', 0)}")
+        print(f"Log trace: {result.get('log_trace', [])}")
         print("-"*100)
     print(result)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -5,11 +5,10 @@ AB testing, error handling, cost tracking, and output validation.
 """
 
 import time
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from bootstrap import get_chat_model
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
-from typing import TypedDict, Literal, Optional
+from typing import Any, Mapping, TypedDict, Literal, Optional
 from pathlib import Path
 
 # Import all production components
@@ -24,8 +23,6 @@ from output_validator import OutputValidator
 from circuit_breaker import CircuitBreaker, CircuitBreakerOpen
 from models import TicketRouting, SupportResponse
 
-load_dotenv()
-
 # Initialize production components
 logger = StructuredLogger("support_system")
 input_sanitizer = InputSanitizer()
@@ -43,7 +40,7 @@ general_breaker = CircuitBreaker(max_failures=3, timeout=60)
 escalate_breaker = CircuitBreaker(max_failures=3, timeout=60)
 
 
-def load_prompt_with_fallback(agent_name: str, user_id: str) -> tuple[dict, str]:
+def load_prompt_with_fallback(agent_name: str, user_id: str) -> tuple[Mapping[str, Any], str]:
     """
     Load prompt with fallback to v1.0.0 if current doesn't exist.
     
@@ -88,17 +85,14 @@ class SupervisorAgent:
     """Supervisor Agent - Routes tickets to appropriate specialists."""
 
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.3
-        ).with_structured_output(TicketRouting)
+        self.llm = get_chat_model(model="gpt-4o-mini", temperature=0.3).with_structured_output(TicketRouting)
 
     @retry_with_backoff(max_retries=3, initial_delay=1.0)
     def route(self, ticket: str, user_id: str) -> TicketRouting:
         """Route the ticket to the appropriate specialist."""
         # Load prompt with fallback
         prompt_data, prompt_version = load_prompt_with_fallback("supervisor", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
+        compiled_prompt = prompt_manager.compile_prompt(prompt_data) # static - ticket goes in the HumanMessage
         
         # Track start time for latency
         start_time = time.time()
@@ -106,7 +100,7 @@ class SupervisorAgent:
         try:
             messages = [
                 SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
+                HumanMessage(content=f"Ticket: {ticket}")
             ]
             # Wrap LLM call with circuit breaker
             routing = supervisor_breaker.call(lambda: self.llm.invoke(messages))
@@ -161,17 +155,14 @@ class BillingAgent:
     """Billing Agent - Handles billing-related tickets."""
 
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.3
-        ).with_structured_output(SupportResponse)
+        self.llm = get_chat_model(model="gpt-4o-mini", temperature=0.3).with_structured_output(SupportResponse)
 
     @retry_with_backoff(max_retries=3, initial_delay=1.0)
     def handle(self, ticket: str, user_id: str) -> SupportResponse:
         """Handle the billing related ticket."""
         # Load prompt with fallback
         prompt_data, prompt_version = load_prompt_with_fallback("billing", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
+        compiled_prompt = prompt_manager.compile_prompt(prompt_data) # static - ticket goes in the HumanMessage
         
         # Track start time for latency
         start_time = time.time()
@@ -179,7 +170,7 @@ class BillingAgent:
         try:
             messages = [
                 SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
+                HumanMessage(content=f"Ticket: {ticket}")
             ]
             # Wrap LLM call with circuit breaker
             response = billing_breaker.call(lambda: self.llm.invoke(messages))
@@ -220,17 +211,14 @@ class TechnicalAgent:
     """Technical Agent - Handles technical-related tickets."""
 
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.3
-        ).with_structured_output(SupportResponse)
+        self.llm = get_chat_model(model="gpt-4o-mini", temperature=0.3).with_structured_output(SupportResponse)
 
     @retry_with_backoff(max_retries=3, initial_delay=1.0)
     def handle(self, ticket: str, user_id: str) -> SupportResponse:
         """Handle the technical related ticket."""
         # Load prompt with fallback
         prompt_data, prompt_version = load_prompt_with_fallback("technical", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
+        compiled_prompt = prompt_manager.compile_prompt(prompt_data) # static - ticket goes in the HumanMessage
         
         # Track start time for latency
         start_time = time.time()
@@ -238,7 +226,7 @@ class TechnicalAgent:
         try:
             messages = [
                 SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
+                HumanMessage(content=f"Ticket: {ticket}")
             ]
             # Wrap LLM call with circuit breaker
             response = technical_breaker.call(lambda: self.llm.invoke(messages))
@@ -279,17 +267,14 @@ class GeneralAgent:
     """General Agent - Handles general-related tickets."""
 
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.3
-        ).with_structured_output(SupportResponse)
+        self.llm = get_chat_model(model="gpt-4o-mini", temperature=0.3).with_structured_output(SupportResponse)
 
     @retry_with_backoff(max_retries=3, initial_delay=1.0)
     def handle(self, ticket: str, user_id: str) -> SupportResponse:
         """Handle the general related ticket."""
         # Load prompt with fallback
         prompt_data, prompt_version = load_prompt_with_fallback("general", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
+        compiled_prompt = prompt_manager.compile_prompt(prompt_data) # static - ticket goes in the HumanMessage
         
         # Track start time for latency
         start_time = time.time()
@@ -297,7 +282,7 @@ class GeneralAgent:
         try:
             messages = [
                 SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
+                HumanMessage(content=f"Ticket: {ticket}")
             ]
             # Wrap LLM call with circuit breaker
             response = general_breaker.call(lambda: self.llm.invoke(messages))
@@ -338,17 +323,14 @@ class EscalateAgent:
     """Escalate Agent - Handles escalated tickets."""
 
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini", 
-            temperature=0.3
-        ).with_structured_output(SupportResponse)
+        self.llm = get_chat_model(model="gpt-4o-mini", temperature=0.3).with_structured_output(SupportResponse)
 
     @retry_with_backoff(max_retries=3, initial_delay=1.0)
     def handle(self, ticket: str, user_id: str) -> SupportResponse:
         """Handle the escalate related ticket."""
         # Load prompt with fallback
         prompt_data, prompt_version = load_prompt_with_fallback("escalate", user_id)
-        compiled_prompt = prompt_manager.compile_prompt(prompt_data, ticket)
+        compiled_prompt = prompt_manager.compile_prompt(prompt_data) # static - ticket goes in the HumanMessage
         
         # Track start time for latency
         start_time = time.time()
@@ -356,7 +338,7 @@ class EscalateAgent:
         try:
             messages = [
                 SystemMessage(content=compiled_prompt),
-                HumanMessage(content=ticket)
+                HumanMessage(content=f"Ticket: {ticket}")
             ]
             # Wrap LLM call with circuit breaker
             response = escalate_breaker.call(lambda: self.llm.invoke(messages))
@@ -16,6 +16,16 @@ class TicketRouting(BaseModel):
     )
     confidence: float = Field(description="The confidence in the routing decision", ge=0.0, le=1.0)
 
+class NumberedTicketRouting(TicketRouting):
+    """ Routing decision for one ticket of a batch """
+    ticket_number: int = Field(description="The number of the ticket this routing is for, as given in the list")
+
+class TicketRoutingBatch(BaseModel):
+    """ Routing decisions for several tickets in one call """
+    routings: list[NumberedTicketRouting] = Field(
+        description="One routing decision per ticket, each tagged with its ticket number"
+    )
+
 class SupportResponse(BaseModel):
     """Structured response from the customer support agent."""
     
@@ -3,12 +3,34 @@ Prompt Manager - Handles versioning and compilation of 4-layer prompts.
 This module implements file-based prompt versioning with Git.
 """
 
+import os
 import yaml
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from datetime import datetime
 
 
+@lru_cache(maxsize=256)
+def _read_prompt_file(path: str, mtime_ns: int) -> Mapping[str, Any]:
+    """
+    Parse a prompt YAML file.
+    
+    Keyed by mtime as well as path: editing the file changes the key, so the
+    next load re-reads it without any explicit invalidation. Every caller
+    shares the result, so it is returned as a read-only view.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        prompt_data = yaml.safe_load(f)
+    
+    # Add metadata
+    prompt_data['parsed_at'] = datetime.utcnow().isoformat()  # when this version was read from disk
+    prompt_data['file_path'] = path
+    prompt_data['mtime_ns'] = mtime_ns
+    return MappingProxyType(prompt_data)
+
+
 class PromptManager:
     """Manages versioned prompts stored as YAML files."""
     
@@ -16,8 +38,12 @@ class PromptManager:
         self.prompts_dir = Path(prompts_dir)
         if not self.prompts_dir.exists():
             self.prompts_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Parsed prompts are cached by _read_prompt_file (keyed by mtime);
+        # their rendered static layers are cached here
+        self._sections_cache: Dict[str, tuple[int, str, str]] = {}  # file_path -> (mtime_ns, head, tail)
     
-    def load_prompt(self, agent_name: str, version: str = "current") -> Dict[str, Any]:
+    def load_prompt(self, agent_name: str, version: str = "current") -> Mapping[str, Any]:
         """
         Load a versioned prompt from disk.
         
@@ -26,24 +52,31 @@ class PromptManager:
             version: Version to load (e.g., "v1.0.0" or "current")
         
         Returns:
-            Dictionary containing prompt data
+            Read-only mapping of the prompt data (shared cache entry - copy with
+            dict(...) before changing it; nested values are not frozen)
         """
         if version == "current":
             prompt_file = self.prompts_dir / agent_name / "current.yaml"
         else:
             prompt_file = self.prompts_dir / agent_name / f"{version}.yaml"
         
-        if not prompt_file.exists():
+        # One stat per load is the freshness check - the parse itself is cached
+        try:
+            mtime_ns = os.stat(prompt_file).st_mtime_ns
+        except FileNotFoundError:
             raise ValueError(f"Prompt not found: {prompt_file}")
         
-        with open(prompt_file, 'r', encoding='utf-8') as f:
-            prompt_data = yaml.safe_load(f)
-        
-        # Add metadata
-        prompt_data['loaded_at'] = datetime.utcnow().isoformat()
-        prompt_data['file_path'] = str(prompt_file)
+        return _read_prompt_file(str(prompt_file), mtime_ns)
+    
+    def invalidate(self):
+        """
+        Drop all cached prompts so the next load re-reads them from disk.
         
-        return prompt_data
+        Edited files are picked up automatically through their mtime - this is
+        only needed if a file is replaced without its mtime changing.
+        """
+        _read_prompt_file.cache_clear()
+        self._sections_cache.clear()
     
     def get_version_history(self, agent_name: str) -> list[str]:
         """List all versions for an agent."""
@@ -57,7 +90,7 @@ class PromptManager:
         ]
         return sorted(versions, reverse=True)
     
-    def compile_prompt(self, prompt_data: Dict[str, Any], user_message: str) -> str:
+    def compile_prompt(self, prompt_data: Mapping[str, Any], user_message: Optional[str] = None) -> str:
         """
         Compile the 4-layer prompt into final text.
         
@@ -67,7 +100,52 @@ class PromptManager:
         3. Context & Examples
         4. Task (current request)
         5. Security (bottom) - Final check
+
+        Only the task layer depends on the user message - the other layers
+        are rendered once per prompt file and reused.
+        
+        Without user_message the prompt is fully static: send it as the
+        SystemMessage and put the request in the HumanMessage. An identical
+        system prefix on every call is what lets provider-side prompt
+        caching (e.g. OpenAI's automatic prompt cache) hit.
         """
+        head, tail = self._static_sections(prompt_data)
+        
+        # Layer 3: Current Task
+        if user_message is None:
+            request_line = "The user's request is in the next message."
+        else:
+            request_line = f"User: {user_message}"
+        
+        task_section = f"""
+CURRENT REQUEST:
+{request_line}
+
+Your task: Analyze this request and respond according to the guidelines above.
+"""
+        
+        # Assemble in order (Sandwich Defense)
+        full_prompt = f"""{head}
+
+{task_section}
+
+{tail}
+"""
+        
+        return full_prompt.strip()
+    
+    def _static_sections(self, prompt_data: Mapping[str, Any]) -> tuple[str, str]:
+        """
+        Render the layers that don't depend on the user message.
+        
+        Returns:
+            Tuple of (head, tail) - everything above and below the task layer
+        """
+        file_path = prompt_data.get('file_path')
+        mtime_ns = prompt_data.get('mtime_ns')
+        cached = self._sections_cache.get(file_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
         
         # Layer 4 (Top): Security Guards
         security_top = prompt_data.get('security', {}).get('top_guard', '')
@@ -80,19 +158,10 @@ class PromptManager:
         context_section = self._format_context(prompt_data.get('context', {}))
         examples_section = self._format_examples(prompt_data.get('examples', []))
         
-        # Layer 3: Current Task
-        task_section = f"""
-CURRENT REQUEST:
-User: {user_message}
-
-Your task: Analyze this request and respond according to the guidelines above.
-"""
-        
         # Layer 4 (Bottom): Security Guards
         security_bottom = prompt_data.get('security', {}).get('bottom_guard', '')
         
-        # Assemble in order (Sandwich Defense)
-        full_prompt = f"""
+        head = f"""
 {security_top}
 
 {role_section}
@@ -101,14 +170,10 @@ Your task: Analyze this request and respond according to the guidelines above.
 
 {context_section}
 
-{examples_section}
-
-{task_section}
-
-{security_bottom}
-"""
-        
-        return full_prompt.strip()
+{examples_section}"""
+        if file_path is not None:
+            self._sections_cache[file_path] = (mtime_ns, head, security_bottom)
+        return head, security_bottom
     
     def _format_role(self, role: Dict) -> str:
         """Format Layer 1: Role section."""
@@ -0,0 +1,51 @@
+"""
+Shared LLM clients - one instance per (model, temperature) for the whole process.
+
+Creating a chat model is not free: the SDK parses its config, builds an HTTP
+transport and opens fresh TLS connections on first use. Getting the model
+through these helpers means every script/request reuses the same client and
+its warm connection pool.
+
+Usage:
+    from llm_clients import get_google_llm, get_openai_llm
+    llm_google = get_google_llm()
+    llm_openai = get_openai_llm(model="gpt-4.1-nano", temperature=1)
+"""
+
+from functools import lru_cache
+
+import httpx
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_openai import ChatOpenAI
+
+# One connection pool shared by every ChatOpenAI instance (sync + async calls)
+_OPENAI_LIMITS = httpx.Limits(max_keepalive_connections=20)
+_openai_http_client = httpx.Client(limits=_OPENAI_LIMITS)
+_openai_http_async_client = httpx.AsyncClient(limits=_OPENAI_LIMITS)
+
+
+def get_google_llm(*, model: str = "gemini-2.5-flash", temperature: float = 0) -> ChatGoogleGenerativeAI:
+    """Return the process-wide Gemini chat model for this model/temperature."""
+    return _google_llm(model, float(temperature))
+
+
+def get_openai_llm(*, model: str = "gpt-4.1-nano", temperature: float = 0) -> ChatOpenAI:
+    """Return the process-wide OpenAI chat model for this model/temperature."""
+    return _openai_llm(model, float(temperature))
+
+
+# The public helpers normalize their (keyword-only) arguments before hitting
+# the cache, so get_google_llm() and get_google_llm(temperature=0) share an entry
+@lru_cache(maxsize=None)
+def _google_llm(model: str, temperature: float) -> ChatGoogleGenerativeAI:
+    return ChatGoogleGenerativeAI(model=model, temperature=temperature)
+
+
+@lru_cache(maxsize=None)
+def _openai_llm(model: str, temperature: float) -> ChatOpenAI:
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        http_client=_openai_http_client,
+        http_async_client=_openai_http_async_client,
+    )
@@ -1,26 +1,35 @@
+import asyncio
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
+from llm_clients import get_google_llm, get_openai_llm
 import gradio as gr
 
 load_dotenv()
 
-llm_openai = ChatOpenAI(model="gpt-4.1-nano", temperature=0)
-llm_google = ChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
+llm_openai = get_openai_llm(model="gpt-4.1-nano", temperature=0)
+llm_google = get_google_llm(temperature=0)
 
-def askGoogle(m1):
-    response = llm_google.invoke(m1)
+async def askGoogle(m1):
+    response = await llm_google.ainvoke(m1)
     return response.content
 
-def askOpenAI(m1):
-    response = llm_openai.invoke(m1)
+async def askOpenAI(m1):
+    response = await llm_openai.ainvoke(m1)
     return response.content
 
-def askLLM(question, llm_choice):
+async def ask_both(m1):
+    # The two providers are independent - call them concurrently so the
+    # answer takes as long as the slower one, not the sum of both
+    return await asyncio.gather(askGoogle(m1), askOpenAI(m1))
+
+# Gradio awaits async handlers natively
+async def askLLM(question, llm_choice):
     if llm_choice == "Gemini":
-        return askGoogle(question)
+        return await askGoogle(question)
     elif llm_choice == "OpenAI":
-        return askOpenAI(question)
+        return await askOpenAI(question)
+    elif llm_choice == "Both":
+        google_answer, openai_answer = await ask_both(question)
+        return f"Gemini:\n{google_answer}\n\nOpenAI:\n{openai_answer}"
     else:
         return "Invalid LLM choice"
 
@@ -29,11 +38,11 @@ demo = gr.Interface(
     fn=askLLM,
     inputs=[
         gr.Textbox(label="Ask Your question here"),
-        gr.Radio(choices=["Gemini", "OpenAI"], label="Choose LLM", value="Gemini")
+        gr.Radio(choices=["Gemini", "OpenAI", "Both"], label="Choose LLM", value="Gemini")
     ],
     outputs=gr.Textbox(label="Response"),
     title="Chat with LLM",
-    description="Chat with Google's Gemini or OpenAI's GPT model"
+    description="Chat with Google's Gemini, OpenAI's GPT model, or both side by side"
 )
 
 if __name__ == "__main__":
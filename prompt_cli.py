@@ -0,0 +1,124 @@
+"""
+Shared plumbing for the topic/audience prompt CLIs (4.1 and 4.2).
+
+Both scripts take --topic/--audience or a --pairs file, cache Gemini
+responses on disk and render the same kind of two-variable prompt; only the
+prompt text and the output handling differ, so those stay in the scripts.
+
+Usage:
+    from prompt_cli import setup_llm_cache, cached_renderer, parse_variables, stream_cached
+    setup_llm_cache()
+    render_prompt = cached_renderer(_build_prompt)
+    variables_list = parse_variables("Generate learning outline using Gemini LLM")
+    for text in stream_cached(llm, render_prompt(topic, audience)):
+        print(text, end="", flush=True)
+"""
+
+import argparse
+import json
+from functools import lru_cache
+from typing import Callable, Iterator
+
+from langchain_community.cache import SQLiteCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.language_models import BaseChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import message_chunk_to_message
+from langchain_core.outputs import ChatGeneration
+from langchain_core.prompt_values import PromptValue
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableBinding
+
+MAX_CONCURRENCY = 10  # max parallel Gemini calls when running a batch of pairs
+
+
+def setup_llm_cache(database_path: str = ".llm_cache.db") -> None:
+    """Install the on-disk response cache - a repeated (model, params, prompt) returns from disk."""
+    set_llm_cache(SQLiteCache(database_path=database_path))
+
+
+def normalize(s: str) -> str:
+    """
+    Collapse whitespace in free-text input.
+
+    " Agentic AI  Bootcamp" and "Agentic AI Bootcamp" then build the same
+    prompt - and therefore hit the same cache entry. Case is kept: the text
+    goes to the model, and acronyms/proper nouns matter.
+    """
+    return " ".join(s.split())
+
+
+def cached_renderer(build_prompt: Callable[[], ChatPromptTemplate]) -> Callable[[str, str], PromptValue]:
+    """
+    Wrap a prompt builder in a per-(topic, audience) render cache.
+
+    A repeated request skips template substitution - a cache level below the
+    LLM response cache. Every caller gets the same PromptValue instance, so
+    callers must not mutate it (e.g. its .messages list).
+    """
+    @lru_cache(maxsize=256)
+    def render(topic: str, audience: str) -> PromptValue:
+        return build_prompt().invoke({"topic": topic, "audience": audience})
+
+    return render
+
+
+def stream_cached(llm: Runnable, prompt_value: PromptValue) -> Iterator[str]:
+    """
+    Stream the response text, going through the global LLM cache.
+
+    BaseChatModel.stream() calls the provider directly and never reads or
+    writes the set_llm_cache() cache - only invoke()/batch() do. So look the
+    prompt up first and replay a hit in one piece; on a miss, stream it and
+    store the assembled message under the key invoke() would use, so later
+    runs (streamed or batched) hit it.
+
+    Args:
+        llm: Chat model, or a chat model with .bind(...) kwargs
+        prompt_value: Rendered prompt
+    """
+    model, kwargs = (llm.bound, llm.kwargs) if isinstance(llm, RunnableBinding) else (llm, {})
+    cache = get_llm_cache()
+    if cache is None or not isinstance(model, BaseChatModel):
+        for chunk in llm.stream(prompt_value):
+            yield chunk.content
+        return
+
+    # Same key BaseChatModel uses for invoke() (see _generate_with_cache)
+    prompt = dumps(prompt_value.to_messages())
+    llm_string = model._get_llm_string(stop=None, **kwargs)
+
+    cached = cache.lookup(prompt, llm_string)
+    if cached:
+        yield cached[0].message.content
+        return
+
+    full = None
+    for chunk in llm.stream(prompt_value):
+        full = chunk if full is None else full + chunk
+        yield chunk.content
+    if full is not None:
+        cache.update(prompt, llm_string, [ChatGeneration(message=message_chunk_to_message(full))])
+
+
+def parse_variables(description: str) -> list[dict]:
+    """Parse --topic/--audience or --pairs into a list of normalized prompt variables."""
+    args = argparse.ArgumentParser(description=description)
+    args.add_argument("--topic", type=str, help="Topic of the learning outline")
+    args.add_argument("--audience", type=str, help="Target audience for the learning outline")
+    args.add_argument("--pairs", type=str, help='JSON file with a list of {"topic": ..., "audience": ...} objects')
+
+    parsed_args = args.parse_args()
+
+    if parsed_args.pairs:
+        with open(parsed_args.pairs, "r", encoding="utf-8") as f:
+            pairs = json.load(f)
+    elif parsed_args.topic and parsed_args.audience:
+        pairs = [{"topic": parsed_args.topic, "audience": parsed_args.audience}]
+    else:
+        args.error("provide --topic and --audience, or --pairs")
+
+    return [
+        {"topic": normalize(pair["topic"]), "audience": normalize(pair["audience"])}
+        for pair in pairs
+    ]